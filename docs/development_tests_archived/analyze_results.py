@@ -1,21 +1,33 @@
 import json
+import os
 
 import numpy as np
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 
+# B/S digit strings for each 9-bit half of the rule int. rule_bits is MSB
+# first, so digit i of a half corresponds to bit (8 - i).
+_BS_STR = tuple(
+    "".join(str(i) for i in range(9) if (n >> (8 - i)) & 1) for n in range(512)
+)
+
 
 def analyze_titans():
     console = Console()
     console.print("[bold blue]Rulial Titans: Mission Analysis[/bold blue]")
 
     try:
-        with open("titans_history.json", "r") as f:
-            history = json.load(f)
+        if os.path.exists("titans_history.jsonl"):
+            with open("titans_history.jsonl", "r") as f:
+                history = [json.loads(line) for line in f if line.strip()]
+        else:
+            # Legacy snapshot written by older probe_2d runs
+            with open("titans_history.json", "r") as f:
+                history = json.load(f)
     except FileNotFoundError:
         console.print(
-            "[red]Error: titans_history.json not found. Run 'probe-2d' first.[/red]"
+            "[red]Error: titans_history.jsonl not found. Run 'probe-2d' first.[/red]"
         )
         return
 
@@ -23,22 +35,20 @@ def analyze_titans():
     console.print(f"Loaded [bold]{total_epochs}[/bold] epochs of exploration data.")
 
     # Metrics extraction
-    entropies = [h["entropy"] for h in history]
+    entropies = np.fromiter((h["entropy"] for h in history), float, total_epochs)
+    surprises = np.fromiter((h["surprise"] for h in history), float, total_epochs)
 
     # 1. Finding 'The Titans' (Class 4 Candidates)
     # Heuristic: Entropy in [0.6, 2.5] (Neither Ice nor Fire)
     # Rule 110 is ~0.94. Game of Life Glider ~1.0.
     # Let's look for this "Sweet Spot".
-
-    candidates = []
-    for h in history:
-        ent = h["entropy"]
-        if 0.6 < ent < 2.5:
-            candidates.append(h)
+    candidate_idx = np.flatnonzero((entropies > 0.6) & (entropies < 2.5))
 
     # Sort candidates by Surprise (Novelty)
     # High surprise means the Neural Net didn't expect this complexity.
-    top_novel = sorted(candidates, key=lambda x: x["surprise"], reverse=True)[:10]
+    # Stable sort keeps epoch order among ties, as sorted() did.
+    order = np.argsort(-surprises[candidate_idx], kind="stable")[:10]
+    top_novel = [history[i] for i in candidate_idx[order]]
 
     table = Table(title="💎 Discovered Class 4 Candidates (Ranked by Surprise)")
     table.add_column("Rule ID", style="cyan")
@@ -47,13 +57,9 @@ def analyze_titans():
     table.add_column("Bits (B/S)", style="green")
 
     for c in top_novel:
-        # Decode rule bits
-        bits = c["rule_bits"]
-        b_bits = bits[:9]
-        s_bits = bits[9:]
-        b_str = "".join([str(i) for i, b in enumerate(b_bits) if b])
-        s_str = "".join([str(i) for i, b in enumerate(s_bits) if b])
-        bs_code = f"B{b_str}/S{s_str}"
+        # Decode rule: high 9 bits are B, low 9 bits are S
+        rule = int(c["rule"])
+        bs_code = f"B{_BS_STR[rule >> 9]}/S{_BS_STR[rule & 0x1FF]}"
 
         table.add_row(
             str(c["rule"]), f"{c['entropy']:.4f}", f"{c['surprise']:.4f}", bs_code
@@ -69,7 +75,7 @@ def analyze_titans():
     [bold]Global Statistics:[/bold]
     Average Entropy: {avg_ent:.4f}
     Max Entropy:     {max_ent:.4f} (Volume Law / Chaos)
-    Candidates Found: {len(candidates)} / {total_epochs}
+    Candidates Found: {candidate_idx.size} / {total_epochs}
     """
     console.print(Panel(msg, title="Mission Report", border_style="white"))
 
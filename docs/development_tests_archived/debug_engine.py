@@ -10,11 +10,10 @@ from rulial.engine.totalistic import Totalistic2DEngine
 
 def debug_print(grid):
     rows, cols = grid.shape
-    for r in range(rows):
-        line = ""
-        for c in range(cols):
-            line += "O" if grid[r, c] else "."
-        print(line)
+    # Map cells to glyphs in one pass, then view each row as a single string
+    chars = np.where(grid.astype(bool), "O", ".")
+    lines = chars.view(f"<U{cols}").ravel()
+    print("\n".join(lines))
     print("-" * cols)
 
 
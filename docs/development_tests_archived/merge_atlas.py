@@ -1,5 +1,8 @@
 """
 Merge partial atlas scans into a single file.
+
+Parts are streamed into the output one at a time, so memory is bounded by
+the largest partial file rather than the combined atlas.
 """
 
 import glob
@@ -8,23 +11,30 @@ import json
 
 def merge():
     files = glob.glob("atlas_part_*.json")
-    combined = []
+    total = 0
 
     print(f"Found {len(files)} partial files.")
 
-    for fpath in files:
-        try:
-            with open(fpath, "r") as f:
-                data = json.load(f)
-                combined.extend(data)
-                print(f"Loaded {len(data)} items from {fpath}")
-        except Exception as e:
-            print(f"Error reading {fpath}: {e}")
-
-    print(f"Total points: {len(combined)}")
-
-    with open("atlas_grid.json", "w") as f:
-        json.dump(combined, f, indent=2)
+    with open("atlas_grid.json", "w") as out:
+        out.write("[")
+        for fpath in files:
+            try:
+                with open(fpath, "r") as f:
+                    data = json.load(f)
+            except Exception as e:
+                print(f"Error reading {fpath}: {e}")
+                continue
+
+            for record in data:
+                if total:
+                    out.write(",\n")
+                out.write(json.dumps(record))
+                total += 1
+            print(f"Loaded {len(data)} items from {fpath}")
+            del data
+        out.write("]\n")
+
+    print(f"Total points: {total}")
     print("Saved to atlas_grid.json")
 
 
@@ -1,3 +1,4 @@
+import functools
 import json
 import time
 
@@ -10,12 +11,24 @@ from rich.panel import Panel
 from rulial.engine.totalistic import Totalistic2DEngine
 
 
-def int_to_bits(n: int, num_bits: int) -> np.ndarray:
-    bin_str = format(n, f"0{num_bits}b")
-    return np.array([int(x) for x in bin_str], dtype=np.float32)
+# B/S digit strings for each 9-bit half of the rule int. Bits are MSB
+# first, so digit i of a half corresponds to bit (8 - i).
+_BS_STR = tuple(
+    "".join(str(i) for i in range(9) if (n >> (8 - i)) & 1) for n in range(512)
+)
 
 
-def replay_filaments():
+def decode_rule(rule_int: int) -> str:
+    """Decode an 18-bit rule int into its B/S string. B (0-8) -> S (9-17)."""
+    return f"B{_BS_STR[(rule_int >> 9) & 0x1FF]}/S{_BS_STR[rule_int & 0x1FF]}"
+
+
+@functools.lru_cache(maxsize=4096)
+def get_engine(rule_int: int) -> Totalistic2DEngine:
+    return Totalistic2DEngine(decode_rule(rule_int))
+
+
+def replay_filaments(frame_delay: float = 0.05, rule_pause: float = 1.0):
     console = Console()
     console.print("[bold cyan]Loading Golden Filaments...[/bold cyan]")
 
@@ -43,28 +56,18 @@ def replay_filaments():
             entropy = item["entropy"]
 
             # Decode Rule Key
-            # We need to reconstruct the B/S string from the int
-            # Same logic as probe_2d
-            rule_bits = int_to_bits(rule_int, 18)
-            b_indices = [i for i, b in enumerate(rule_bits[0:9]) if b == 1]
-            s_indices = [i for i, b in enumerate(rule_bits[9:18]) if b == 1]
-            b_str = "".join(map(str, b_indices))
-            s_str = "".join(map(str, s_indices))
-            rule_str = f"B{b_str}/S{s_str}"
+            rule_str = decode_rule(rule_int)
 
             # Run a short demo for each
-            engine = Totalistic2DEngine(rule_str)
+            engine = get_engine(rule_int)
             # Use a slightly larger grid for the gallery
             h, w = 40, 80
             history = engine.simulate(h, w, 60, "random")  # 60 frames
 
             for grid in history:
-                # Viz
-                viz_str = ""
-                for r in range(h):
-                    for c in range(w):
-                        viz_str += "█" if grid[r, c] else " "
-                    viz_str += "\n"
+                # Viz: one glyph per cell, each row viewed as a single string
+                rows = np.where(grid.astype(bool), "█", " ").view(f"<U{w}")
+                viz_str = "".join(row + "\n" for row in rows.ravel())
 
                 layout["header"].update(
                     Panel(
@@ -82,11 +85,24 @@ def replay_filaments():
                     )
                 )
 
-                time.sleep(0.05)
+                if frame_delay > 0:
+                    time.sleep(frame_delay)
 
             # Pause between rules
-            time.sleep(1.0)
+            if rule_pause > 0:
+                time.sleep(rule_pause)
 
 
 if __name__ == "__main__":
-    replay_filaments()
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--fast", action="store_true", help="Replay without frame/rule pauses"
+    )
+    args = parser.parse_args()
+
+    if args.fast:
+        replay_filaments(frame_delay=0.0, rule_pause=0.0)
+    else:
+        replay_filaments()
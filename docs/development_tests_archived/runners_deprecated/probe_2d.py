@@ -1,4 +1,12 @@
+import functools
+import gc
+import json
+import lzma
+import sys
 import time
+import zlib
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
 
 import numpy as np
 from rich.layout import Layout
@@ -11,20 +19,75 @@ from rulial.navigator.titans import TitansNavigator
 from rulial.quantum.bridge import TensorBridge
 
 
+# Bit shifts for the 18-bit rule code, MSB first
+_SHIFTS_18 = np.arange(17, -1, -1, dtype=np.int64)
+
+
+def _shifts(num_bits: int) -> np.ndarray:
+    if num_bits == 18:
+        return _SHIFTS_18
+    return np.arange(num_bits - 1, -1, -1, dtype=np.int64)
+
+
 def int_to_bits(n: int, num_bits: int) -> np.ndarray:
-    # Ensure binary string is padded
-    bin_str = format(n, f"0{num_bits}b")
-    # If n exceeds num_bits, it might be longer, handle optional truncation or strictness
-    # For now assume n fits
-    return np.array([int(x) for x in bin_str], dtype=np.float32)
+    # MSB first; assumes n fits in num_bits
+    return ((int(n) >> _shifts(num_bits)) & 1).astype(np.float32)
 
 
 def bits_to_int(bits: np.ndarray) -> int:
-    return int("".join(str(int(b)) for b in bits), 2)
+    bits = np.asarray(bits).astype(np.int64)
+    return int((bits << _shifts(len(bits))).sum())
+
+
+# B/S digit strings for each 9-bit half of the rule int. Bits are MSB
+# first, so digit i of a half corresponds to bit (8 - i).
+_BS_STR = tuple(
+    "".join(str(i) for i in range(9) if (n >> (8 - i)) & 1) for n in range(512)
+)
+
+
+def decode_rule(rule_int: int) -> str:
+    """Decode an 18-bit rule int into its B/S string. B (0-8) -> S (9-17)."""
+    return f"B{_BS_STR[(rule_int >> 9) & 0x1FF]}/S{_BS_STR[rule_int & 0x1FF]}"
+
+
+@functools.lru_cache(maxsize=4096)
+def get_engine(rule_int: int) -> Totalistic2DEngine:
+    """Shared engine per rule; the navigator revisits rules constantly."""
+    return Totalistic2DEngine(decode_rule(rule_int))
+
+
+def _simulate_rules(rules, height, width, steps, seed=None):
+    """
+    Simulate rules as one batch and keep only the last two frames.
+    Module-level so it can run in a worker process.
+    """
+    if seed is not None:
+        np.random.seed(seed)
+    batch = Totalistic2DEngine.simulate_batch(
+        [get_engine(r) for r in rules], height, width, steps
+    )
+    results = []
+    for r, hist in zip(rules, batch, strict=True):
+        prev = hist[-2].copy() if len(hist) > 1 else None
+        results.append((r, hist[-1].copy(), prev))
+    return results
 
 
 class RulialProbe2D:
-    def __init__(self, width=64, height=64, steps=100, seed_rule=224, obs_window=12):
+    def __init__(
+        self,
+        width=64,
+        height=64,
+        steps=100,
+        seed_rule=224,
+        obs_window=12,
+        deep_compress=False,
+        rule_cache_size=8192,
+        batch_size=1,
+        workers=1,
+        frame_delay=0.0,
+    ):
         # 1. Physics (The Universe)
         self.width = width
         self.height = height
@@ -50,6 +113,8 @@ class RulialProbe2D:
 
         self.current_rule = seed_rule
         self.history = []
+        # Append-only log, one JSON record per epoch
+        self.history_path = "titans_history.jsonl"
 
         # Camera State (Active Observer)
         self.camera_x = float(width) / 2.0
@@ -57,47 +122,99 @@ class RulialProbe2D:
 
         # Golden Cache
         self.filaments = []
+        self._filament_rules = set()  # O(1) duplicate check
+
+        # LZMA is only worth its cost when the ratio is inspected closely;
+        # the class heuristic is happy with a fast zlib estimate.
+        self.deep_compress = deep_compress
+
+        # Observation cache: rule_int -> (last frame, previous frame, entropy).
+        # Bounded LRU so revisited rules skip simulation and contraction.
+        self.rule_cache_size = rule_cache_size
+        self._rule_cache = OrderedDict()
+
+        # Batched exploration: the navigator proposes batch_size candidates
+        # at a time; they are simulated together and visited in order.
+        self.batch_size = batch_size
+        self._queue = deque()  # (rule_int, predicted_entropy)
+        self._prefetched = {}  # rule_int -> (last frame, previous frame)
+
+        # Worker processes for batch simulation (only used when batch_size > 1).
+        # Entropy contraction stays in-process since it depends on the camera.
+        self.workers = workers
+        self._executor = None
+
+        # Optional per-epoch pause for demos (seconds); 0 runs flat out.
+        self.frame_delay = frame_delay
 
     def run_loop(self, max_epochs=1000):
         layout = self._create_layout()
 
+        if self.workers > 1 and self.batch_size > 1:
+            # Recycle workers periodically to bound RAM
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, max_tasks_per_child=50
+            )
+        try:
+            self._run_epochs(layout, max_epochs)
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(cancel_futures=True)
+                self._executor = None
+
+        # Final Save
+        self.save_results()
+
+    def _run_epochs(self, layout, max_epochs):
         # Using rich Live context
-        with Live(layout, refresh_per_second=4, screen=True):
+        with (
+            open(self.history_path, "a", buffering=1) as hist_fp,
+            Live(layout, refresh_per_second=4, screen=True),
+        ):
             for epoch in range(max_epochs):
                 # --- Step A: Action (Simulate) ---
 
-                rule_bits = int_to_bits(self.current_rule, 18)
-                # Parse bits: B (0-8) -> S (9-17)
-                b_indices = [i for i, b in enumerate(rule_bits[0:9]) if b == 1]
-                s_indices = [i for i, b in enumerate(rule_bits[9:18]) if b == 1]
-
-                b_str = "".join(map(str, b_indices))
-                s_str = "".join(map(str, s_indices))
-                rule_str = f"B{b_str}/S{s_str}"
-
-                # Instantiate engine with current rule
-                engine = Totalistic2DEngine(rule_str)
+                rule_key = int(self.current_rule)
+                rule_bits = int_to_bits(rule_key, 18)
+                rule_str = decode_rule(rule_key)
+
+                cached = self._rule_cache.get(rule_key)
+                if cached is not None:
+                    # Revisit: reuse the stored observation
+                    self._rule_cache.move_to_end(rule_key)
+                    full_grid, prev_frame, _ = cached
+                elif rule_key in self._prefetched:
+                    full_grid, prev_frame = self._prefetched.pop(rule_key)
+                else:
+                    # Engine for current rule (cached across revisits)
+                    engine = get_engine(rule_key)
 
-                # Run Simulation
-                grid_history = engine.simulate(
-                    self.height, self.width, self.steps, "random"
-                )
+                    # Run Simulation
+                    grid_history = engine.simulate(
+                        self.height, self.width, self.steps, "random"
+                    )
 
-                # Use the last frame for observation
-                full_grid = grid_history[-1]
+                    # Use the last frame for observation. Copies so the cache
+                    # does not pin the whole history array.
+                    full_grid = grid_history[-1].copy()
+                    prev_frame = (
+                        grid_history[-2].copy() if len(grid_history) > 1 else None
+                    )
 
                 # --- CROP GRID FOR OBSERVER (Active Born-Maxwell Focus) ---
 
                 # 1. Measure "Born Probability" (Center of Mass of Activity)
                 # We want to focus on where the information IS.
                 active_rows, active_cols = np.nonzero(full_grid)
+                # Population (Active Cells) comes free with the nonzero scan
+                active_cells = active_rows.size
 
                 target_y, target_x = self.camera_y, self.camera_x
 
-                if len(active_rows) > 0:
+                if active_cells > 0:
                     # Calculate CoM
-                    com_y = np.mean(active_rows)
-                    com_x = np.mean(active_cols)
+                    com_y = active_rows.mean()
+                    com_x = active_cols.mean()
 
                     # 2. Maxwell's Demon (Camera Movement)
                     # Apply momentum/smoothing to avoid jitter
@@ -133,14 +250,27 @@ class RulialProbe2D:
                 grid_crop = full_grid[y1:y2, x1:x2]
 
                 # --- Step B: Observation (Collapse) ---
-                # Convert to Tensor Network and measure Entropy
-                tn = self.bridge.grid_to_tensor_state(grid_crop)
-
-                # Explicit garbage collection for previous steps if needed
-                # But Python scopes should handle it.
-
-                entropy_data = self.bridge.compute_bipartition_entropy(tn)
-                entropy = entropy_data["entropy"]
+                # Each live cell in the crop is one open qubit. Dead crops and
+                # crops past the bridge's qubit limit have a predetermined
+                # answer (0.0 / -1.0 sentinel), so skip building the network.
+                if cached is not None:
+                    entropy = cached[2]
+                else:
+                    crop_active = np.count_nonzero(grid_crop)
+                    if crop_active == 0:
+                        entropy = 0.0
+                    elif crop_active > self.bridge.HARD_QUBIT_LIMIT:
+                        entropy = -1.0
+                    else:
+                        # Convert to Tensor Network and measure Entropy
+                        tn = self.bridge.grid_to_tensor_state(grid_crop)
+                        entropy_data = self.bridge.compute_bipartition_entropy(tn)
+                        entropy = entropy_data["entropy"]
+
+                    if self.rule_cache_size > 0:
+                        self._rule_cache[rule_key] = (full_grid, prev_frame, entropy)
+                        if len(self._rule_cache) > self.rule_cache_size:
+                            self._rule_cache.popitem(last=False)
 
                 # --- Step C: Cognition (Learn) ---
                 # Teach Titans Memory
@@ -163,31 +293,35 @@ class RulialProbe2D:
                 surprise = self.navigator.probe_and_learn(rule_bits, learning_entropy)
 
                 # --- Step D: Decision (Hallucinate) ---
-                # Titans imagines neighbor rules and picks the most complex one
-                next_rule_vec, pred_entropy = self.navigator.hallucinate_neighbors(
-                    rule_bits
-                )
-                next_rule = bits_to_int(next_rule_vec)
+                # Titans imagines neighbor rules and picks the most complex ones
+                if not self._queue:
+                    vecs, preds = self.navigator.hallucinate_candidates(
+                        rule_bits, k=self.batch_size
+                    )
+                    self._queue.extend(
+                        (bits_to_int(v), float(p)) for v, p in zip(vecs, preds, strict=True)
+                    )
+                    self._prefetch([r for r, _ in self._queue])
+                next_rule, pred_entropy = self._queue.popleft()
 
                 # --- Derived Metrics for Classification ---
                 # 1. Dynamism (Pixel Delta) derived from last 2 frames
                 # We need the second to last frame.
-                if len(grid_history) > 1:
-                    last_frame = grid_history[-1].astype(int)
-                    prev_frame = grid_history[-2].astype(int)
-                    dynamism = np.sum(np.abs(last_frame - prev_frame))
+                # Binary grids: XOR marks changed cells without int temporaries
+                if prev_frame is not None:
+                    dynamism = int(np.count_nonzero(full_grid ^ prev_frame))
                 else:
                     dynamism = 0
 
-                # 2. Population (Active Cells)
-                active_cells = np.sum(full_grid)
-
-                # 3. Compression Ratio (Quick check using LZMA)
-                import lzma
+                # 2. Population (Active Cells) computed above with the CoM
 
+                # 3. Compression Ratio (Quick check using zlib level 1)
                 # Pack grid to bytes for compression
                 grid_bytes = full_grid.tobytes()
-                compressed = lzma.compress(grid_bytes)
+                if self.deep_compress:
+                    compressed = lzma.compress(grid_bytes)
+                else:
+                    compressed = zlib.compress(grid_bytes, 1)
                 compression_ratio = len(compressed) / len(grid_bytes)
 
                 # 4. Wolfram Class Inference (Heuristic)
@@ -211,7 +345,7 @@ class RulialProbe2D:
 
                 # --- Visualization Update ---
                 record = {
-                    "rule": int(self.current_rule),
+                    "rule": rule_key,
                     "rule_bits": [int(x) for x in rule_bits],
                     "entropy": float(entropy),
                     "surprise": float(surprise),
@@ -225,6 +359,7 @@ class RulialProbe2D:
                     "compression_ratio": float(compression_ratio),
                 }
                 self.history.append(record)
+                hist_fp.write(json.dumps(record, separators=(",", ":")) + "\n")
 
                 # --- Capture Golden Filaments ---
                 # Criteria: Not Chaos (-1 / <0), Not Ice (<0.1)
@@ -233,9 +368,8 @@ class RulialProbe2D:
                 if is_stable_liquid:
                     # Check if recently added to avoid duplicates from immediate neighbors?
                     # For now just log all unique rule ints
-                    if not any(
-                        f["rule"] == int(self.current_rule) for f in self.filaments
-                    ):
+                    if rule_key not in self._filament_rules:
+                        self._filament_rules.add(rule_key)
                         self.filaments.append(record)
 
                 self._update_display(
@@ -256,34 +390,53 @@ class RulialProbe2D:
                 # Move to next rule
                 self.current_rule = next_rule
 
-                # Explicit Garbage Collection to prevent OOM
-                import gc
-
-                gc.collect()
-
-                time.sleep(0.5)  # Pause for visual stability and CPU cooling
-
-        # Final Save
-        self.save_results()
+                # Occasional garbage collection; a full collect walks every
+                # tracked object, so doing it per epoch grows with history.
+                if epoch % 200 == 0:
+                    gc.collect()
+
+                if self.frame_delay > 0:
+                    time.sleep(self.frame_delay)  # Visual stability for demos
+
+    def _prefetch(self, rules):
+        """Simulate uncached candidate rules as one batch."""
+        todo = list(
+            dict.fromkeys(
+                r
+                for r in rules
+                if r not in self._rule_cache and r not in self._prefetched
+            )
+        )
+        if not todo:
+            return
+        shape = (self.height, self.width, self.steps)
+        if self._executor is None or len(todo) < 2:
+            results = _simulate_rules(todo, *shape)
+        else:
+            # Fresh seed per chunk so forked workers don't share RNG state
+            chunks = [todo[i :: self.workers] for i in range(self.workers)]
+            futures = [
+                self._executor.submit(
+                    _simulate_rules, chunk, *shape, np.random.randint(2**31)
+                )
+                for chunk in chunks
+                if chunk
+            ]
+            results = [res for fut in futures for res in fut.result()]
+        for r, last, prev in results:
+            self._prefetched[r] = (last, prev)
 
     def save_results(self):
-        import json
-
-        filename = "titans_history.json"
+        # History is streamed to self.history_path every epoch; only the
+        # (small) filament cache is rewritten here.
+        filename = "golden_filaments.json"
 
-        # Basic serialization
         try:
-            with open(filename, "w") as f:
-                json.dump(self.history, f, indent=2)
-
-            # Save Filaments
             if self.filaments:
-                with open("golden_filaments.json", "w") as f:
+                with open(filename, "w") as f:
                     json.dump(self.filaments, f, indent=2)
             # Update footer to show saved status logic would need access to layout, but skipping for simplicity
         except Exception as e:
-            import sys
-
             print(
                 f"Failed to save results to {filename}: {e}", file=sys.stderr
             )  # Don't crash UI on save fail
@@ -322,14 +475,12 @@ class RulialProbe2D:
 
         # Universe (ASCII Grid)
         # Downsample grid for CLI viewing if huge
-        view_h, view_w = grid.shape
-        viz_str = ""
         # Limit view
-        for r in range(min(view_h, 30)):
-            row_str = ""
-            for c in range(min(view_w, 60)):
-                row_str += "█" if grid[r, c] else " "
-            viz_str += row_str + "\n"
+        grid_view = grid[:30, :60]
+        view_w = grid_view.shape[1]
+        # One glyph per cell, then each row viewed as a single string
+        rows = np.where(grid_view.astype(bool), "█", " ").view(f"<U{view_w}")
+        viz_str = "".join(row + "\n" for row in rows.ravel())
 
         layout["universe"].update(
             Panel(viz_str, title="Spacetime Projection", border_style="green")
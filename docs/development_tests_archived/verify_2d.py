@@ -3,11 +3,9 @@ from rulial.engine.totalistic import Totalistic2DEngine
 
 def print_grid(grid):
     rows, cols = grid.shape
-    for r in range(rows):
-        line = ""
-        for c in range(cols):
-            line += "■" if grid[r, c] else "·"
-        print(line)
+    chars = np.where(grid.astype(bool), "■", "·")
+    lines = chars.view(f"<U{cols}").ravel()
+    print("\n".join(lines))
     print("-" * cols)
 
 
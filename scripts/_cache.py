@@ -0,0 +1,45 @@
+"""
+On-disk memo of per-rule analysis results, shared across script runs.
+
+Entries live in a small SQLite table keyed by (kind, key). ``kind`` names
+the analysis and its version (e.g. "VacuumCondensateAnalyzer/v1"), so bumping
+the version string retires old entries; ``key`` encodes the rule and the
+parameters the result depends on. Values are stored as JSON.
+
+Lookups and writes happen in the parent process only; workers never touch
+the database.
+"""
+
+import json
+import sqlite3
+from pathlib import Path
+from typing import Optional
+
+DEFAULT_CACHE_PATH = Path(__file__).parent.parent / "data" / "analyzer_cache.db"
+
+
+class AnalysisCache:
+    """Persistent (kind, key) -> JSON value store."""
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS results "
+            "(kind TEXT, key TEXT, value TEXT, PRIMARY KEY (kind, key))"
+        )
+
+    def get(self, kind: str, key: str) -> Optional[object]:
+        row = self.conn.execute(
+            "SELECT value FROM results WHERE kind = ? AND key = ?", (kind, key)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, kind: str, key: str, value) -> None:
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?)",
+                (kind, key, json.dumps(value)),
+            )
+
+    def close(self) -> None:
+        self.conn.close()
@@ -0,0 +1,63 @@
+"""
+Rule-string and result-file helpers shared by the analysis scripts.
+
+S-sets are digit strings such as "23"; their digit sums are computed in
+bulk with one table lookup over the raw bytes instead of per-character
+int() calls. atlas_table builds the column table the atlas scripts work
+from, S-sum and S-count included. write_json saves a script's results.
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Byte value -> digit value, zero for anything that is not 0-9.
+_DIGIT_VALUE = np.zeros(256, dtype=np.int64)
+_DIGIT_VALUE[ord("0") : ord("9") + 1] = np.arange(10)
+
+
+def s_sums(s_sets) -> np.ndarray:
+    """Digit sum of every S-set string, via one table lookup over their bytes."""
+    codes = np.array(s_sets, dtype=bytes)
+    width = codes.dtype.itemsize
+    return _DIGIT_VALUE[codes.view(np.uint8).reshape(-1, width)].sum(axis=1)
+
+
+def s_set_to_sum(s_str: str) -> int:
+    """Convert S-set string to sum of digits."""
+    return int(_DIGIT_VALUE[np.frombuffer(s_str.encode(), dtype=np.uint8)].sum())
+
+
+def atlas_table(atlas: np.ndarray) -> dict:
+    """
+    Column table of an atlas structured array (analysis.load_atlas_arrays):
+    column slices of the fields the scripts use, plus S-sum and S-count
+    derived from s_set so nothing downstream re-parses it.
+    """
+    s_sets = atlas["s_set"]
+    return {
+        "rule": atlas["rule_str"],
+        "b_set": atlas["b_set"],
+        "eq_density": atlas["equilibrium_density"],
+        "is_condensate": atlas["is_condensate"],
+        "tpe_mode": atlas["tpe_mode"],
+        "s_sum": s_sums(s_sets),
+        "s_count": np.char.str_len(s_sets).astype(np.intp),
+    }
+
+
+def write_json(path: Path, obj) -> None:
+    """Write obj to path as JSON indented by 2, with orjson when installed."""
+    if HAS_ORJSON:
+        path.write_bytes(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, "w") as f:
+            json.dump(obj, f, indent=2)
@@ -0,0 +1,42 @@
+"""
+Per-process simulation objects for the scripts that fan rules out over a
+ProcessPoolExecutor.
+
+Each getter is memoized, so a process builds its object once and reuses
+it for every rule it handles. The init_* functions are pool initializers
+that do that build when the worker starts rather than on its first rule.
+"""
+
+import functools
+
+
+@functools.lru_cache(maxsize=None)
+def get_analyzer(grid_size: int, steps: int):
+    """
+    This process's VacuumCondensateAnalyzer for (grid_size, steps).
+
+    The instance is reused across rules together with the engine and
+    history buffer it keeps between analyze() calls, so it is mutable
+    per-process state: use it from one thread at a time.
+    """
+    from rulial.mapper.condensate import VacuumCondensateAnalyzer
+
+    return VacuumCondensateAnalyzer(grid_size=grid_size, steps=steps)
+
+
+def init_analyzer_worker(grid_size: int = 48, steps: int = 300):
+    """Pool initializer: build the worker's analyzer (and its buffers) up front."""
+    get_analyzer(grid_size, steps)
+
+
+@functools.lru_cache(maxsize=None)
+def get_engine():
+    """This process's Totalistic2DEngine; rules are swapped in with set_rule."""
+    from rulial.engine.totalistic import Totalistic2DEngine
+
+    return Totalistic2DEngine()
+
+
+def init_engine_worker():
+    """Pool initializer: build the worker's engine up front."""
+    get_engine()
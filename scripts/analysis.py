@@ -15,24 +15,127 @@ Usage:
     uv run python -m scripts.analysis tpe_analysis
 """
 
+import functools
 import json
+import os
 import sys
-from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Iterator, Sequence
 
 import numpy as np
 
+try:
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
 
-def load_atlas(filename: str = "atlas_v4_condensate.json") -> list:
-    """Load atlas data from JSON file."""
+
+def _atlas_path(filename: str) -> Path:
     path = Path(filename)
     if not path.exists():
         print(f"Error: {filename} not found. Run the atlas scan first.")
         sys.exit(1)
-    with open(path) as f:
+    return path
+
+
+@functools.lru_cache(maxsize=4)
+def load_atlas(filename: str = "atlas_v4_condensate.json") -> list:
+    """Load atlas data from JSON file (memoized per filename)."""
+    with open(_atlas_path(filename)) as f:
         return json.load(f)
 
 
+def iter_atlas(filename: str, fields: Sequence[str]) -> Iterator[tuple]:
+    """
+    Stream atlas records, yielding only the requested fields as a tuple.
+
+    Uses ijson when installed so the full record list is never held in
+    memory; otherwise falls back to json.load.
+    """
+    with open(_atlas_path(filename), "rb") as f:
+        records = ijson.items(f, "item", use_float=True) if HAS_IJSON else json.load(f)
+        for r in records:
+            yield tuple(r.get(k) for k in fields)
+
+
+# Columns projected out of each atlas record for the analyses below
+ATLAS_DTYPE = np.dtype([
+    ('rule_str', 'U21'),
+    ('b_set', 'U9'),
+    ('s_set', 'U9'),
+    ('wolfram_class', 'i1'),
+    ('phase', 'U16'),
+    ('is_condensate', '?'),
+    ('equilibrium_density', 'f8'),
+    ('expansion_factor', 'f8'),
+    ('tpe_mode', 'U16'),
+    ('emergence', 'f8'),
+    ('toroidal', 'f8'),
+    ('poloidal', 'f8'),
+])
+
+# Stand-ins for missing/null fields, by dtype kind
+_MISSING = {'U': '', 'i': -1, 'b': False, 'f': np.nan}
+
+
+@functools.lru_cache(maxsize=4)
+def load_atlas_arrays(filename: str = "atlas_v4_condensate.json") -> np.ndarray:
+    """
+    Load the atlas as a structured array with the ATLAS_DTYPE columns.
+
+    The projection is cached next to the JSON as a .npy file and
+    memory-mapped on later runs, as long as it is newer than the JSON and
+    has the current ATLAS_DTYPE columns.
+    """
+    path = _atlas_path(filename)
+    cache = path.with_suffix('.npy')
+    if cache.exists() and cache.stat().st_mtime >= path.stat().st_mtime:
+        atlas = np.load(cache, mmap_mode='r')
+        if atlas.dtype == ATLAS_DTYPE:
+            return atlas
+    
+    fields = ATLAS_DTYPE.names
+    defaults = [_MISSING[ATLAS_DTYPE[k].kind] for k in fields]
+    atlas = np.array(
+        [
+            tuple(d if v is None else v for v, d in zip(rec, defaults, strict=True))
+            for rec in iter_atlas(filename, fields)
+        ],
+        dtype=ATLAS_DTYPE,
+    )
+    try:
+        np.save(cache, atlas)
+    except OSError:
+        pass  # Read-only data directory; just skip the cache
+    return atlas
+
+
+def _value_counts(column: np.ndarray) -> dict:
+    """Count occurrences per distinct value (sorted by value) in one C pass."""
+    values, counts = np.unique(column, return_counts=True)
+    return dict(zip(values.tolist(), counts.tolist(), strict=True))
+
+
+def _argsort_slice(values: np.ndarray, k: int) -> np.ndarray:
+    """
+    Like np.argsort(values, kind='stable')[:k] for k > 0, or [k:] for
+    k < 0, but selects with argpartition so only |k| elements get sorted.
+    Ties straddling the cut may pick a different (equal-valued) record.
+    """
+    n = values.size
+    if k == 0 or abs(k) >= n:
+        order = np.argsort(values, kind='stable')
+        return order[:k] if k >= 0 else order[k:]
+    if k > 0:
+        idx = np.argpartition(values, k - 1)[:k]
+    else:
+        idx = np.argpartition(values, n + k)[n + k:]
+    idx.sort()  # Ties keep record order, as with a stable sort
+    return idx[np.argsort(values[idx], kind='stable')]
+
+
 def condensate_summary():
     """
     Section 3.1: B0 Rules Are Universally Condensate
@@ -42,28 +145,37 @@ def condensate_summary():
     print("═══ CONDENSATE SCAN SUMMARY ═══")
     print("Section 3.1: B0 Rules Are Universally Condensate\n")
     
-    data = load_atlas("atlas_v4_condensate.json")
+    atlas = load_atlas_arrays()
+    total = len(atlas)
+    classes = _value_counts(atlas['wolfram_class'])
+    phases = _value_counts(atlas['phase'])
+    condensates = atlas['is_condensate']
+    eq_densities = atlas['equilibrium_density'][condensates]
+    expansions = atlas['expansion_factor'][condensates]
     
-    print(f"Total rules analyzed: {len(data)}")
+    print(f"Total rules analyzed: {total}")
     
     # Count by class
-    classes = Counter(r['wolfram_class'] for r in data)
-    print(f"\nWolfram Classes: {dict(sorted(classes.items()))}")
+    print(f"\nWolfram Classes: {classes}")
     
     # Count by phase
-    phases = Counter(r['phase'] for r in data)
-    print(f"Phases: {dict(phases)}")
+    print(f"Phases: {phases}")
     
     # Condensate stats
-    condensates = [r for r in data if r['is_condensate']]
-    print(f"\nCondensates: {len(condensates)}/{len(data)} ({100*len(condensates)/len(data):.1f}%)")
+    n_condensates = len(eq_densities)
+    print(f"\nCondensates: {n_condensates}/{total} ({100*n_condensates/total:.1f}%)")
     
-    if condensates:
-        eq_densities = [r['equilibrium_density'] for r in condensates]
-        print(f"Equilibrium density range: {min(eq_densities):.1%} - {max(eq_densities):.1%}")
-        
-        expansions = [r['expansion_factor'] for r in condensates]
-        print(f"Expansion factor range: {min(expansions):.0f} - {max(expansions):.0f}")
+    if n_condensates:
+        print(f"Equilibrium density range: {eq_densities.min():.1%} - {eq_densities.max():.1%}")
+        print(f"Expansion factor range: {expansions.min():.0f} - {expansions.max():.0f}")
+
+
+def _analyze_one(rule: str) -> tuple:
+    """Worker for control_test: analyze one rule in a fresh analyzer."""
+    from rulial.mapper.condensate import VacuumCondensateAnalyzer
+    
+    result = VacuumCondensateAnalyzer(grid_size=32, steps=80).analyze(rule)
+    return result.is_condensate, result.equilibrium_density
 
 
 def control_test():
@@ -75,8 +187,6 @@ def control_test():
     print("═══ CONTROL TEST: NON-B0 RULES ═══")
     print("Section 3.6: Non-B0 Rules Are Particle-Phase\n")
     
-    from rulial.mapper.condensate import VacuumCondensateAnalyzer
-    
     test_rules = [
         ('B3/S23', 'Game of Life'),
         ('B36/S23', 'HighLife'),
@@ -90,19 +200,21 @@ def control_test():
         ('B4678/S35678', 'Anneal'),
     ]
     
-    analyzer = VacuumCondensateAnalyzer(grid_size=32, steps=80)
+    # Rules are independent; analyze them in parallel, report in order
+    workers = min(len(test_rules), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        results = list(ex.map(_analyze_one, [rule for rule, _ in test_rules]))
     
     condensates = 0
     particles = 0
     
-    for rule, name in test_rules:
-        result = analyzer.analyze(rule)
-        phase = '🌊 CONDENSATE' if result.is_condensate else '⚛️ PARTICLE'
-        if result.is_condensate:
+    for (rule, name), (is_condensate, eq_density) in zip(test_rules, results, strict=True):
+        phase = '🌊 CONDENSATE' if is_condensate else '⚛️ PARTICLE'
+        if is_condensate:
             condensates += 1
         else:
             particles += 1
-        print(f'{rule:20s} ({name:15s}) {phase} eq={result.equilibrium_density:.1%}')
+        print(f'{rule:20s} ({name:15s}) {phase} eq={eq_density:.1%}')
     
     print('\n═══ SUMMARY ═══')
     print(f'Particles: {particles}/{len(test_rules)} ({100*particles/len(test_rules):.0f}%)')
@@ -123,53 +235,47 @@ def s_correlation():
     print("═══ S-PARAMETER CORRELATION ANALYSIS ═══")
     print("Section 3.7: S-Set Predicts Vacuum Energy\n")
     
-    data = load_atlas("atlas_v4_condensate.json")
-    
-    records = []
-    for r in data:
-        s_set = r['s_set']
-        s_digits = [int(c) for c in s_set] if s_set else []
-        s_count = len(s_digits)
-        s_sum = sum(s_digits) if s_digits else 0
-        s_mean = np.mean(s_digits) if s_digits else 0
-        
-        records.append({
-            'rule': r['rule_str'],
-            'eq_density': r['equilibrium_density'],
-            's_count': s_count,
-            's_sum': s_sum,
-            's_mean': s_mean,
-        })
-    
-    eq_densities = [r['eq_density'] for r in records]
-    s_counts = [r['s_count'] for r in records]
-    s_sums = [r['s_sum'] for r in records]
-    s_means = [r['s_mean'] for r in records]
+    atlas = load_atlas_arrays()
+    rules = atlas['rule_str']
+    
+    # s_set is fixed-width U9, so its code points view as an (N, 9) array
+    # (0 = padding, otherwise '0'..'8') and each S statistic is one pass
+    codes = np.ascontiguousarray(atlas['s_set']).view(np.uint32).reshape(len(atlas), -1)
+    present = codes != 0
+    s_counts = present.sum(axis=1)
+    
+    # One contiguous (4, N) block: S-count, S-sum, S-mean, eq_density
+    stats = np.empty((4, len(atlas)))
+    stats[0] = s_counts
+    stats[1] = (codes - ord('0')).sum(axis=1, where=present)
+    np.divide(stats[1], np.maximum(s_counts, 1), out=stats[2])
+    stats[3] = atlas['equilibrium_density']
+    _, s_sums, _, eq_densities = stats
+    
+    corr = np.corrcoef(stats)
     
     print("CORRELATIONS:")
-    print(f'  S-count vs eq_density: r = {np.corrcoef(s_counts, eq_densities)[0,1]:.3f}')
-    print(f'  S-sum vs eq_density:   r = {np.corrcoef(s_sums, eq_densities)[0,1]:.3f} ← STRONGEST')
-    print(f'  S-mean vs eq_density:  r = {np.corrcoef(s_means, eq_densities)[0,1]:.3f}')
+    print(f'  S-count vs eq_density: r = {corr[3, 0]:.3f}')
+    print(f'  S-sum vs eq_density:   r = {corr[3, 1]:.3f} ← STRONGEST')
+    print(f'  S-mean vs eq_density:  r = {corr[3, 2]:.3f}')
     
     # Group by S-count
     print('\nEQUILIBRIUM DENSITY BY S-COUNT:')
-    by_count = defaultdict(list)
-    for r in records:
-        by_count[r['s_count']].append(r['eq_density'])
+    sums = np.bincount(s_counts, weights=eq_densities)
+    ns = np.bincount(s_counts)
+    means = sums / np.maximum(ns, 1)
     
-    for count in sorted(by_count.keys()):
-        densities = by_count[count]
-        print(f'  S-count={count}: mean={np.mean(densities):.1%} (n={len(densities)})')
+    for count in np.flatnonzero(ns):
+        print(f'  S-count={count}: mean={means[count]:.1%} (n={ns[count]})')
     
     # Extremes
     print('\nEXTREMES:')
-    sorted_records = sorted(records, key=lambda x: x['eq_density'])
     print('Lowest density:')
-    for r in sorted_records[:3]:
-        print(f"  {r['rule']:25s} S-sum={r['s_sum']:2d} eq={r['eq_density']:.1%}")
+    for i in _argsort_slice(eq_densities, 3):
+        print(f"  {rules[i]:25s} S-sum={s_sums[i]:2.0f} eq={eq_densities[i]:.1%}")
     print('Highest density:')
-    for r in sorted_records[-3:]:
-        print(f"  {r['rule']:25s} S-sum={r['s_sum']:2d} eq={r['eq_density']:.1%}")
+    for i in _argsort_slice(eq_densities, -3):
+        print(f"  {rules[i]:25s} S-sum={s_sums[i]:2.0f} eq={eq_densities[i]:.1%}")
 
 
 def tpe_analysis():
@@ -181,26 +287,25 @@ def tpe_analysis():
     print("═══ T-P+E DYNAMICS ANALYSIS ═══")
     print("Section 3.3: Toroidal-Poloidal Dynamics\n")
     
-    data = load_atlas("atlas_v4_condensate.json")
+    atlas = load_atlas_arrays()
+    emergence = atlas['emergence']
     
     # T-P+E modes
-    tpe_modes = Counter(r['tpe_mode'] for r in data)
+    tpe_modes = _value_counts(atlas['tpe_mode'])
     print("T-P+E MODE DISTRIBUTION:")
     for mode, count in sorted(tpe_modes.items(), key=lambda x: -x[1]):
-        print(f'  {mode:15s}: {count:3d} ({100*count/len(data):.1f}%)')
+        print(f'  {mode:15s}: {count:3d} ({100*count/len(atlas):.1f}%)')
     
     # Check for T-dominant
-    t_dominant = [r for r in data if r['tpe_mode'] == 'T-dominant']
-    print(f'\nT-dominant rules: {len(t_dominant)} (condensates never fragment)')
+    print(f"\nT-dominant rules: {tpe_modes.get('T-dominant', 0)} (condensates never fragment)")
     
     # Top by emergence
     print('\nTOP 5 BY EMERGENCE (E = T·P × |T-P|):')
-    sorted_by_e = sorted(data, key=lambda x: x['emergence'], reverse=True)[:5]
-    for r in sorted_by_e:
+    for r in atlas[_argsort_slice(-emergence, 5)]:
         print(f"  {r['rule_str']:20s} E={r['emergence']:.4f} T={r['toroidal']:.2f} P={r['poloidal']:.2f}")
     
     # P distribution for condensates
-    p_values = [r['poloidal'] for r in data]
+    p_values = atlas['poloidal']
     print('\nP (Poloidal) Statistics:')
     print(f'  Mean: {np.mean(p_values):.3f}')
     print(f'  Min:  {np.min(p_values):.3f}')
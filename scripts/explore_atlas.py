@@ -15,12 +15,37 @@ import argparse
 import sqlite3
 from pathlib import Path
 
-import numpy as np
+# numpy / matplotlib / rulial are imported where needed, keeping --help and
+# the SQL-only reports fast to start
 
 
 def connect(db_path: str):
     """Connect to atlas database."""
-    return sqlite3.connect(db_path)
+    conn = sqlite3.connect(db_path)
+    # Indexes for the GROUP BY / range queries below (no-op once created)
+    try:
+        conn.executescript(
+            """
+            CREATE INDEX IF NOT EXISTS idx_wc ON explorations(wolfram_class);
+            CREATE INDEX IF NOT EXISTS idx_H ON explorations(harmonic_overlap);
+            CREATE INDEX IF NOT EXISTS idx_hdist
+                ON explorations(ABS(harmonic_overlap - 0.5))
+                WHERE harmonic_overlap BETWEEN 0.3 AND 0.6;
+            """
+        )
+    except sqlite3.OperationalError:
+        pass  # Read-only database; queries still work, just unindexed
+    # Everything below only reads: scan through mmap'd pages with a large
+    # cache rather than pread per 4KB page
+    conn.executescript(
+        """
+        PRAGMA mmap_size = 30000000000;
+        PRAGMA cache_size = -262144;
+        PRAGMA temp_store = MEMORY;
+        PRAGMA query_only = ON;
+        """
+    )
+    return conn
 
 
 def overview(conn):
@@ -31,11 +56,29 @@ def overview(conn):
     print("  ATLAS OVERVIEW")
     print("═" * 60)
 
+    # Totals, Goldilocks count and H stats in a single scan
+    total, goldilocks, h_min, h_max, h_avg = cur.execute(
+        """
+        SELECT
+            COUNT(*),
+            TOTAL(harmonic_overlap BETWEEN 0.3 AND 0.6),
+            MIN(harmonic_overlap),
+            MAX(harmonic_overlap),
+            AVG(harmonic_overlap)
+        FROM explorations
+    """
+    ).fetchone()
+    goldilocks = int(goldilocks)
+
     # Total rules
-    total = cur.execute("SELECT COUNT(*) FROM explorations").fetchone()[0]
     print(f"\n📊 Total rules scanned: {total:,}")
 
     # Wolfram class distribution
+    class_counts = dict(
+        cur.execute(
+            "SELECT wolfram_class, COUNT(*) FROM explorations GROUP BY wolfram_class"
+        )
+    )
     print("\n🧠 Wolfram Class Distribution:")
     for class_id, name in [
         (1, "Dies out"),
@@ -43,33 +86,19 @@ def overview(conn):
         (3, "Chaotic"),
         (4, "Complex"),
     ]:
-        count = cur.execute(
-            "SELECT COUNT(*) FROM explorations WHERE wolfram_class=?", (class_id,)
-        ).fetchone()[0]
+        count = class_counts.get(class_id, 0)
         pct = 100 * count / total if total > 0 else 0
         bar = "█" * int(pct / 2)
         print(f"  Class {class_id} ({name:15}): {count:6,} ({pct:5.1f}%) {bar}")
 
     # Goldilocks zone
-    goldilocks = cur.execute(
-        "SELECT COUNT(*) FROM explorations WHERE harmonic_overlap BETWEEN 0.3 AND 0.6"
-    ).fetchone()[0]
     print(
         f"\n🌟 Goldilocks Zone (H=0.3-0.6): {goldilocks:,} rules ({100*goldilocks/total:.1f}%)"
     )
 
     # Harmonic overlap stats
-    stats = cur.execute(
-        """
-        SELECT 
-            MIN(harmonic_overlap), 
-            MAX(harmonic_overlap), 
-            AVG(harmonic_overlap)
-        FROM explorations
-    """
-    ).fetchone()
     print(
-        f"\n📈 Harmonic Overlap: min={stats[0]:.3f}, max={stats[1]:.3f}, avg={stats[2]:.3f}"
+        f"\n📈 Harmonic Overlap: min={h_min:.3f}, max={h_max:.3f}, avg={h_avg:.3f}"
     )
 
     # Fractal class distribution
@@ -91,16 +120,23 @@ def top_goldilocks(conn, n: int = 20):
     print(f"\n{'Rule':<20} {'H':>8} {'d_f':>8} {'Class':>6} {'Fractal':>15}")
     print("-" * 60)
 
-    rows = cur.execute(
-        """
+    # Without ANALYZE stats the planner prefers a range seek on idx_H plus a
+    # temp sort, so pin the partial expression index: walking idx_hdist in
+    # order stops after n rows. Fall back if the index couldn't be created
+    # (read-only DB).
+    query = """
         SELECT rule_str, harmonic_overlap, fractal_dimension, wolfram_class, fractal_class
-        FROM explorations 
+        FROM explorations {hint}
         WHERE harmonic_overlap BETWEEN 0.3 AND 0.6
         ORDER BY ABS(harmonic_overlap - 0.5)
         LIMIT ?
-    """,
-        (n,),
-    ).fetchall()
+    """
+    try:
+        rows = cur.execute(
+            query.format(hint="INDEXED BY idx_hdist"), (n,)
+        ).fetchall()
+    except sqlite3.OperationalError:
+        rows = cur.execute(query.format(hint=""), (n,)).fetchall()
 
     for row in rows:
         print(f"{row[0]:<20} {row[1]:>8.3f} {row[2]:>8.3f} {row[3]:>6} {row[4]:>15}")
@@ -129,18 +165,33 @@ def find_similar(conn, rule_str: str, n: int = 10):
     )
     print("=" * 60)
 
-    # Find similar by H and d_f
-    rows = cur.execute(
-        """
+    # Find similar by H and d_f.
+    # distance >= |dH|, so once the n-th best match inside an H window of
+    # radius w is within w, nothing outside the window can beat it. Grow
+    # the window (seeking on idx_H) until that holds, then fall back to a
+    # full scan.
+    query = """
         SELECT rule_str, harmonic_overlap, fractal_dimension, wolfram_class,
                ABS(harmonic_overlap - ?) + ABS(fractal_dimension - ?) as distance
         FROM explorations 
-        WHERE rule_str != ?
+        WHERE rule_str != ? AND harmonic_overlap IS NOT NULL
+          AND fractal_dimension IS NOT NULL {window}
         ORDER BY distance
         LIMIT ?
-    """,
-        (h, d_f, rule_str, n),
-    ).fetchall()
+    """
+    w = 0.01
+    while w < 1.0:
+        rows = cur.execute(
+            query.format(window="AND harmonic_overlap BETWEEN ? AND ?"),
+            (h, d_f, rule_str, h - w, h + w, n),
+        ).fetchall()
+        if len(rows) == n and rows[-1][4] <= w:
+            break
+        w *= 2
+    else:
+        rows = cur.execute(
+            query.format(window=""), (h, d_f, rule_str, n)
+        ).fetchall()
 
     print(f"\n{'Rule':<20} {'H':>8} {'d_f':>8} {'Class':>6} {'Distance':>10}")
     print("-" * 60)
@@ -150,8 +201,14 @@ def find_similar(conn, rule_str: str, n: int = 10):
 
 def visualize(conn, output_dir: str = "data/visualizations"):
     """Generate visualizations of the atlas data."""
+    import numpy as np
+
     try:
+        import matplotlib
+
+        matplotlib.use("Agg")  # Files only; skip GUI backend discovery
         import matplotlib.pyplot as plt
+        from matplotlib.colors import ListedColormap
     except ImportError:
         print("❌ matplotlib not installed. Run: uv pip install matplotlib")
         return
@@ -161,21 +218,25 @@ def visualize(conn, output_dir: str = "data/visualizations"):
 
     print("\n📊 Generating visualizations...")
 
-    # Fetch data
-    rows = cur.execute(
-        """
-        SELECT harmonic_overlap, fractal_dimension, wolfram_class, equilibrium_density
-        FROM explorations
-    """
-    ).fetchall()
+    # Fetch data straight into a typed array (NULL -> NaN)
+    total = cur.execute("SELECT COUNT(*) FROM explorations").fetchone()[0]
+    data = np.fromiter(
+        cur.execute(
+            "SELECT harmonic_overlap, fractal_dimension, wolfram_class FROM explorations"
+        ),
+        dtype=[("H", "f8"), ("d_f", "f8"), ("wc", "f8")],
+        count=total,
+    )
 
-    H = np.array([r[0] for r in rows])
-    d_f = np.array([r[1] for r in rows])
-    wc = np.array([r[2] for r in rows])
+    H = data["H"]
+    d_f = data["d_f"]
+    wc = data["wc"]
 
     # 1. Harmonic Overlap Distribution
+    # (binned up front; stairs draws one path instead of 50 bar patches)
     plt.figure(figsize=(10, 6))
-    plt.hist(H, bins=50, edgecolor="black", alpha=0.7, color="steelblue")
+    counts, edges = np.histogram(H[~np.isnan(H)], bins=50)
+    plt.stairs(counts, edges, fill=True, alpha=0.7, color="steelblue")
     plt.axvline(0.3, color="red", linestyle="--", label="Goldilocks Zone")
     plt.axvline(0.6, color="red", linestyle="--")
     plt.xlabel("Harmonic Overlap (H)")
@@ -196,16 +257,27 @@ def visualize(conn, output_dir: str = "data/visualizations"):
         4: "Class 4 (Complex)",
     }
 
-    for c in [1, 2, 3, 4]:
-        mask = wc == c
-        plt.scatter(H[mask], d_f[mask], c=colors[c], alpha=0.3, s=10, label=labels[c])
+    # Hexbin instead of per-point scatter: each cell shows the median class
+    # of the rules that fall in it, drawn with the class colors above
+    valid = ~(np.isnan(H) | np.isnan(d_f) | np.isnan(wc))
+    plt.hexbin(
+        H[valid],
+        d_f[valid],
+        C=wc[valid],
+        reduce_C_function=np.median,
+        gridsize=200,
+        cmap=ListedColormap([colors[c] for c in [1, 2, 3, 4]]),
+        vmin=0.5,
+        vmax=4.5,
+    )
+    cbar = plt.colorbar(ticks=[1, 2, 3, 4])
+    cbar.ax.set_yticklabels([labels[c] for c in [1, 2, 3, 4]])
 
     plt.axvline(0.3, color="red", linestyle="--", alpha=0.5)
     plt.axvline(0.6, color="red", linestyle="--", alpha=0.5)
     plt.xlabel("Harmonic Overlap (H)")
     plt.ylabel("Fractal Dimension (d_f)")
     plt.title("Phase Space: Harmonic Overlap vs Fractal Dimension")
-    plt.legend()
     plt.tight_layout()
     plt.savefig(f"{output_dir}/phase_space.png", dpi=150)
     print(f"  ✓ {output_dir}/phase_space.png")
@@ -237,6 +309,8 @@ def simulate_rule(rule_str: str, size: int = 64, steps: int = 100):
 
     import time
 
+    import numpy as np
+
     engine = Totalistic2DEngine(rule_str)
     np.random.seed(42)
     history = engine.simulate(size, size, steps, "random", density=0.3)
@@ -244,22 +318,20 @@ def simulate_rule(rule_str: str, size: int = 64, steps: int = 100):
     print(f"\n🎬 Simulating {rule_str} ({size}x{size}, {steps} steps)")
     print("Press Ctrl+C to stop\n")
 
+    # ASCII render (downsample for terminal)
+    scale = max(1, size // 40)
+    rows, cols = slice(0, min(size, 40), scale), slice(0, min(size, 80), scale)
+
     try:
         for i, grid in enumerate(history):
-            # Clear screen
-            print("\033c", end="")
-            print(f"Rule: {rule_str} | Step: {i+1}/{steps} | Population: {grid.sum()}")
-
-            # ASCII render (downsample for terminal)
-            scale = max(1, size // 40)
-            for y in range(0, min(size, 40), scale):
-                row = ""
-                for x in range(0, min(size, 80), scale):
-                    if grid[y, x] > 0:
-                        row += "██"
-                    else:
-                        row += "  "
-                print(row)
+            # Map cells to glyphs in one pass, view each row as a single
+            # string, and emit the whole frame (with screen clear) at once
+            chars = np.where(grid[rows, cols] > 0, "██", "  ")
+            lines = chars.view(f"<U{2 * chars.shape[1]}").ravel()
+            print(
+                f"\033cRule: {rule_str} | Step: {i+1}/{steps} | "
+                f"Population: {np.count_nonzero(grid)}\n" + "\n".join(lines)
+            )
 
             time.sleep(0.05)
     except KeyboardInterrupt:
@@ -1,31 +1,120 @@
 import gzip
+import re
 import sqlite3
 
 import numpy as np
-import torch
-from tqdm import tqdm
 
-from rulial.learning.hypercube import generate_hypercube_graph
-from rulial.learning.sheaf_learner import SheafLearner
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# torch, tqdm and the rulial learners are imported inside the functions
+# that use them, so importing the string helpers stays cheap
+
+
+# Digit string for every 9-bit half (bit d set -> digit d present)
+_DIGITS = np.array(
+    ["".join(str(d) for d in range(9) if (m >> d) & 1) for m in range(512)]
+)
+_MASK_BY_DIGITS = {digits: m for m, digits in enumerate(_DIGITS.tolist())}
+_RULE_RE = re.compile(r"B(\d*)/S(\d*)")
+
+
+def _digits_to_mask(digits: str) -> int:
+    mask = _MASK_BY_DIGITS.get(digits)
+    if mask is None:  # Non-canonical digit order
+        mask = 0
+        for c in digits:
+            mask |= 1 << int(c)
+    return mask
 
 
 def rule_str_to_index(rule_str: str) -> int:
     """Convert 'B.../S...' string to 18-bit integer index."""
-    b_part, s_part = rule_str.split("/")
-    b_digits = [int(c) for c in b_part[1:]]
-    s_digits = [int(c) for c in s_part[1:]]
+    b_digits, s_digits = _RULE_RE.match(rule_str).groups()
+    return _digits_to_mask(b_digits) | (_digits_to_mask(s_digits) << 9)
+
+
+def rule_strs_to_indices(rule_strs) -> np.ndarray:
+    """
+    rule_str_to_index over a sequence of rule strings, in one NumPy pass.
+
+    The strings are viewed as an (N, width) byte array. Each digit byte
+    becomes its bit (1 << digit), the B and S digit runs are located per
+    row, and each run is OR-reduced into a 9-bit mask.
+    """
+    codes = np.asarray(rule_strs, dtype=bytes)
+    n = codes.size
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    # Three zero bytes of padding: every row ends in non-digits, and the
+    # "/S" lookups below stay in bounds
+    width = codes.dtype.itemsize + 3
+    codes = codes.astype(f"S{width}").view(np.uint8).reshape(n, width)
+    rows = np.arange(n)
+    col = np.arange(width, dtype=np.intp)
+    digit = codes - np.uint8(ord("0"))
+    is_digit = digit <= 9
+
+    # "B", the B digits up to the first non-digit, then "/S" and the S
+    # digits up to the next non-digit; anything after that is ignored,
+    # as with _RULE_RE.match
+    slash = np.argmax(~is_digit[:, 1:], axis=1) + 1
+    s_start = slash + 2
+    after = col >= s_start[:, None]
+    s_end = np.argmax(~is_digit & after, axis=1)
+    ok = (
+        (codes[:, 0] == ord("B"))
+        & (codes[rows, slash] == ord("/"))
+        & (codes[rows, slash + 1] == ord("S"))
+    )
+    if not ok.all():
+        bad = np.flatnonzero(~ok)[0]
+        raise ValueError(f"Not a B/S rule string: {rule_strs[bad]!r}")
+
+    # Bit of each digit byte (bits 0-9 fit in int16), zero elsewhere
+    bits = np.left_shift(np.int16(1), np.minimum(digit, 10), dtype=np.int16)
+    bits[~is_digit] = 0
+    b_mask = np.bitwise_or.reduce(bits * (col < slash[:, None]), axis=1)
+    s_mask = np.bitwise_or.reduce(bits * (after & (col < s_end[:, None])), axis=1)
+    return b_mask.astype(np.int64) | (s_mask.astype(np.int64) << 9)
 
-    idx = 0
-    for d in b_digits:
-        idx |= 1 << d
-    for d in s_digits:
-        idx |= 1 << (d + 9)
-    return idx
+
+def indices_to_rule_strs(idx: np.ndarray) -> np.ndarray:
+    """Vectorized index_to_rule_str via the 512-entry digit table."""
+    idx = np.asarray(idx, dtype=np.int64)
+    b = np.char.add("B", _DIGITS[idx & 0x1FF])
+    s = np.char.add("/S", _DIGITS[(idx >> 9) & 0x1FF])
+    return np.char.add(b, s)
+
+
+def connect(db_path="data/atlas_full_v6_gpu.db"):
+    """Open the atlas read-only with mmap'd I/O and a large page cache."""
+    conn = sqlite3.connect(db_path)
+    conn.executescript(
+        """
+        PRAGMA mmap_size = 30000000000;
+        PRAGMA cache_size = -262144;
+        PRAGMA temp_store = MEMORY;
+        PRAGMA query_only = ON;
+        """
+    )
+    return conn
+
+
+# Quads per joined gzip write / edges per progress tick
+WRITE_BATCH = 1_000_000
 
 
 def load_data(db_path="data/atlas_full_v6_gpu.db"):
+    import torch
+
     print(f"Loading data from {db_path}...")
-    conn = sqlite3.connect(db_path)
+    conn = connect(db_path)
     cur = conn.cursor()
 
     rows = cur.execute("SELECT rule_str, wolfram_class FROM explorations").fetchall()
@@ -35,29 +124,42 @@ def load_data(db_path="data/atlas_full_v6_gpu.db"):
     labels = torch.zeros(num_nodes, dtype=torch.long)
     mask = torch.zeros(num_nodes, dtype=torch.bool)
 
-    for r_str, wc in rows:
-        idx = rule_str_to_index(r_str)
-        if wc == 4:
-            labels[idx] = 1
-        else:
-            labels[idx] = 0
-        mask[idx] = True
+    if rows:
+        rule_strs, wcs = zip(*rows, strict=True)
+        # Two vector writes instead of per-element tensor indexing
+        indices = torch.from_numpy(rule_strs_to_indices(rule_strs))
+        labels[indices] = torch.from_numpy(np.array(wcs) == 4).long()
+        mask[indices] = True
     return labels, mask
 
 
 def index_to_rule_str(idx: int) -> str:
-    b_set = []
-    s_set = []
-    for b in range(9):
-        if (idx >> b) & 1:
-            b_set.append(str(b))
-    for s in range(9):
-        if (idx >> (s + 9)) & 1:
-            s_set.append(str(s))
-    return f"B{''.join(b_set) if b_set else ''}/S{''.join(s_set) if s_set else ''}"
-
-
-def export_cayley(output_path="data/rule_space.nq.gz"):
+    return f"B{_DIGITS[idx & 0x1FF]}/S{_DIGITS[(idx >> 9) & 0x1FF]}"
+
+
+def write_edges_parquet(src, dst, resonant, path):
+    """Write kept edges as (u, v, rel) columns; rel is +1 resonant, -1 tense."""
+    table = pa.Table.from_arrays(
+        [
+            pa.array(src.astype(np.int32)),
+            pa.array(dst.astype(np.int32)),
+            pa.array(np.where(resonant, 1, -1).astype(np.int8)),
+        ],
+        names=["u", "v", "rel"],
+    )
+    pq.write_table(table, path, compression="zstd", compression_level=1)
+
+
+def export_cayley(
+    output_path="data/rule_space.nq.gz",
+    parquet_path="data/rule_space_edges.parquet",
+):
+    import torch
+    from tqdm import tqdm
+
+    from rulial.learning.hypercube import generate_hypercube_graph
+    from rulial.learning.sheaf_learner import SheafLearner
+
     print("Exporting Rule Space for Cayley...")
 
     device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
@@ -79,13 +181,28 @@ def export_cayley(output_path="data/rule_space.nq.gz"):
     print("Computing Sheaf Geometry...")
 
     row, col = edge_index
-    # Process in chunks to save memory
+    # Process in chunks to save memory (half-precision on GPU halves it)
     num_edges = edge_index.shape[1]
-    chunk_size = 100000
-
-    restrictions = []
-
-    with torch.no_grad():
+    use_amp = device.type == "cuda"
+    chunk_size = 1_000_000 if use_amp else 100000
+
+    def infer_chunk(h, chunk_row, chunk_col):
+        edge_input = torch.cat([h[chunk_row], h[chunk_col]], dim=-1)
+        # Use layer 1 learner (1D stalk -> one rho per edge)
+        return torch.tanh(model.sheaf1.restriction_learner(edge_input)).reshape(-1)
+
+    # On GPU, compile the chunk once and replay it as a CUDA graph; shapes
+    # must stay fixed, so the tail chunk is padded up to chunk_size below
+    if use_amp:
+        infer_chunk = torch.compile(infer_chunk, mode="reduce-overhead", dynamic=False)
+
+    # Only strong edges (|rho| >= 0.5) are kept; weak ones are neutral
+    keep_src, keep_dst, keep_sign = [], [], []
+
+    with (
+        torch.no_grad(),
+        torch.autocast(device_type=device.type, dtype=torch.float16, enabled=use_amp),
+    ):
         # Get Node Embeddings from Encoder first
         h = torch.relu(model.encoder(x))
 
@@ -93,31 +210,65 @@ def export_cayley(output_path="data/rule_space.nq.gz"):
             chunk_row = row[i : i + chunk_size]
             chunk_col = col[i : i + chunk_size]
 
-            edge_input = torch.cat([h[chunk_row], h[chunk_col]], dim=-1)
-            # Use layer 1 learner
-            rho = torch.tanh(model.sheaf1.restriction_learner(edge_input))
-            restrictions.append(rho.cpu().numpy())
-
-    restrictions = np.concatenate(restrictions)
-
-    # 4. Load Metadata (Wolfram Class, H)
-    conn = sqlite3.connect("data/atlas_full_v6_gpu.db")
+            n = chunk_row.shape[0]
+            if use_amp and n < chunk_size:
+                # Pad with node 0 and drop the padded outputs
+                pad = chunk_row.new_zeros(chunk_size - n)
+                rho = infer_chunk(
+                    h, torch.cat([chunk_row, pad]), torch.cat([chunk_col, pad])
+                )[:n]
+            else:
+                rho = infer_chunk(h, chunk_row, chunk_col)
+
+            # Threshold on-device so only surviving edges cross to the host
+            keep = rho.abs() >= 0.5
+            keep_src.append(chunk_row[keep])
+            keep_dst.append(chunk_col[keep])
+            keep_sign.append(rho[keep] > 0)
+
+    src_np = torch.cat(keep_src).cpu().numpy()
+    dst_np = torch.cat(keep_dst).cpu().numpy()
+    resonant_np = torch.cat(keep_sign).cpu().numpy()
+    num_kept = src_np.shape[0]
+
+    # Columnar copy of the edge list for bulk loaders / out-of-process
+    # N-Quad conversion (optional; needs pyarrow)
+    if HAS_PYARROW and parquet_path:
+        write_edges_parquet(src_np, dst_np, resonant_np, parquet_path)
+        print(f"Wrote {num_kept} edges to {parquet_path}")
+
+    # 4. Load Metadata (Wolfram Class, H) as dense arrays indexed by rule int
+    conn = connect()
     cur = conn.cursor()
     rows = cur.execute(
         "SELECT rule_str, wolfram_class, harmonic_overlap FROM explorations"
     ).fetchall()
-    metadata = {r[0]: (r[1], r[2]) for r in rows}
     conn.close()
 
+    # wc 255 marks rules missing from the atlas; NaN marks a missing H
+    wc_arr = np.full(2**18, 255, dtype=np.uint8)
+    h_arr = np.full(2**18, np.nan, dtype=np.float64)
+    if rows:
+        rule_strs, wcs, hs = zip(*rows, strict=True)
+        meta_idx = rule_strs_to_indices(rule_strs)
+        wc_arr[meta_idx] = wcs
+        h_arr[meta_idx] = np.array(hs, dtype=np.float64)
+
     # 5. Write N-Quads
     print(f"Writing N-Quads to {output_path}...")
 
-    with gzip.open(output_path, "wt") as f:
+    # Level 1 gzip: ~3x faster than the default for a modest size cost
+    with gzip.open(output_path, "wt", compresslevel=1) as f:
         # Write Nodes
         # Only write nodes that are in our atlas OR are connected by strong edges?
         # Writing all 262k nodes is fine.
 
-        nodes_written = set()
+        # Quads are buffered and written in large joined chunks
+        pending = []
+
+        def flush():
+            f.write("".join(pending))
+            pending.clear()
 
         # Helper to format quad
         def write_quad(s, p, o, label=""):
@@ -133,58 +284,58 @@ def export_cayley(output_path="data/rule_space.nq.gz"):
             o_fmt = fmt(o)
 
             if label:
-                f.write(f"{s_fmt} {p_fmt} {o_fmt} <{label}> .\n")
+                pending.append(f"{s_fmt} {p_fmt} {o_fmt} <{label}> .\n")
             else:
-                f.write(f"{s_fmt} {p_fmt} {o_fmt} .\n")
+                pending.append(f"{s_fmt} {p_fmt} {o_fmt} .\n")
+            if len(pending) >= WRITE_BATCH:
+                flush()
 
         # Write Edges with Sheaf Type
         # Only write "interesting" edges to keep graph sparse?
         # Threshold: |rho| > 0.8
 
         edge_count = 0
-        src_np = edge_index[0].cpu().numpy()
-        dst_np = edge_index[1].cpu().numpy()
 
-        for i in tqdm(range(num_edges)):
-            rho = restrictions[i].item()
-
-            if abs(rho) < 0.5:
-                continue  # Weak connection (neutral)
-
-            u_idx = src_np[i]
-            v_idx = dst_np[i]
-
-            # Use smaller index as source to deduplicate undirected edges?
-            # Creating Directed edges for Cayley visualization flow
-
-            u_str = index_to_rule_str(u_idx)
-            v_str = index_to_rule_str(v_idx)
-
-            rel = "resonant" if rho > 0 else "tense"
-
-            # Edge quad
-            write_quad(f"rule:{u_str}", f"rel:{rel}", f"rule:{v_str}")
-            edge_count += 1
-
-            nodes_written.add(u_str)
-            nodes_written.add(v_str)
-
-        # Write Node Properties
-        for rule_str in nodes_written:
-            if rule_str in metadata:
-                wc, h = metadata[rule_str]
+        # Node names for the whole cube, built once and gathered per edge
+        node_strs = indices_to_rule_strs(np.arange(2**18))
+        node_terms = np.char.add(np.char.add("<rule:", node_strs), ">")
+        node_strs = node_strs.tolist()
+
+        # Edge quads are assembled a batch at a time with vectorized string
+        # ops (gather u/v terms, pick the relation, concatenate); no per-edge
+        # Python. Directed edges are kept as-is for Cayley's visualization.
+        for start in tqdm(range(0, num_kept, WRITE_BATCH)):
+            batch = slice(start, start + WRITE_BATCH)
+            rel = np.where(resonant_np[batch], " <rel:resonant> ", " <rel:tense> ")
+            lines = np.char.add(node_terms[src_np[batch]], rel)
+            lines = np.char.add(np.char.add(lines, node_terms[dst_np[batch]]), " .\n")
+            f.write("".join(lines.tolist()))
+            edge_count += len(lines)
+
+        # Write Node Properties for every endpoint of a kept edge
+        nodes_written = np.zeros(2**18, dtype=bool)
+        nodes_written[src_np] = True
+        nodes_written[dst_np] = True
+
+        for idx in np.flatnonzero(nodes_written).tolist():
+            rule_str = node_strs[idx]
+            wc = int(wc_arr[idx])
+            if wc != 255:
+                h = float(h_arr[idx])
                 write_quad(f"rule:{rule_str}", "prop:wolfram_class", f'"{wc}"')
-                if h is not None:
+                if h == h:  # not NaN
                     write_quad(
                         f"rule:{rule_str}", "prop:harmonic_overlap", f'"{h:.3f}"'
                     )
 
                 # Add "is_goldilocks"
-                if 0.3 <= (h or 0) <= 0.6:
+                if 0.3 <= h <= 0.6:
                     write_quad(f"rule:{rule_str}", "type:goldilocks", "true")
             else:
                 write_quad(f"rule:{rule_str}", "prop:wolfram_class", '"unknown"')
 
+        flush()
+
     print(f"Exported {edge_count} significant edges to {output_path}")
 
 
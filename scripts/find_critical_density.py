@@ -8,38 +8,55 @@ to find the exact density at which percolation breaks down.
 Hypothesis: The critical density is ~18-20%, near the 2D percolation threshold.
 """
 
-import json
+import os
 import sys
-from itertools import combinations
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations, repeat
 from pathlib import Path
+from typing import Optional
 
 import numpy as np
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from rulial.mapper.condensate import VacuumCondensateAnalyzer
+from _rules import write_json
+from _workers import get_analyzer, init_analyzer_worker
 
 
-def generate_all_b0_s_combinations():
-    """Generate all possible B0/S... rules."""
+def _build_rule_table():
+    """Build every B0/S... rule once, with its S-sum and S-count alongside."""
     rules = []
+    s_sums = []
+    s_counts = []
     # S can be any subset of {0,1,2,3,4,5,6,7,8}
-    digits = "012345678"
-
     for r in range(10):  # 0 to 9 S-parameters
-        for combo in combinations(digits, r):
-            s_str = "".join(combo)
-            rule = f"B0/S{s_str}" if s_str else "B0/S"
-            rules.append(rule)
+        for combo in combinations(range(9), r):
+            rules.append("B0/S" + "".join(map(str, combo)))
+            s_sums.append(sum(combo))
+            s_counts.append(r)
+
+    return rules, np.array(s_sums, dtype=np.int8), np.array(s_counts, dtype=np.int8)
+
 
-    return rules
+# All 512 B0 rules as parallel columns (rule string, S-sum, S-count)
+_ALL_RULES, _S_SUMS, _S_COUNTS = _build_rule_table()
 
 
-def measure_density(rule_str: str, grid_size: int = 48, steps: int = 300) -> float:
-    """Measure equilibrium density of a rule."""
+def generate_all_b0_s_combinations():
+    """Generate all possible B0/S... rules."""
+    return list(_ALL_RULES)
+
+
+def measure_density(
+    rule_str: str,
+    grid_size: int = 48,
+    steps: int = 300,
+    seed: Optional[np.random.SeedSequence] = None,
+) -> float:
+    """Measure equilibrium density of a rule; initial grids are drawn from ``seed``."""
     try:
-        analyzer = VacuumCondensateAnalyzer(grid_size=grid_size, steps=steps)
-        result = analyzer.analyze(rule_str)
+        analyzer = get_analyzer(grid_size, steps)
+        result = analyzer.analyze(rule_str, rng=np.random.default_rng(seed))
         return result.equilibrium_density
     except Exception:
         return -1.0
@@ -54,38 +71,49 @@ def find_critical_density():
     print("Scanning B0/S... rules to find minimum stable density...")
     print()
 
-    rules = generate_all_b0_s_combinations()
-    print(f"Generated {len(rules)} possible B0 rules")
+    print(f"Generated {len(_ALL_RULES)} possible B0 rules")
     print()
 
-    # Sample a subset for speed
-    np.random.seed(42)
-    sample_rules = np.random.choice(rules, size=min(100, len(rules)), replace=False)
-
-    results = []
-
-    for i, rule in enumerate(sample_rules):
-        print(f"\r[{i+1}/{len(sample_rules)}] Testing {rule:<20}", end="", flush=True)
-        density = measure_density(rule)
-        if density >= 0:
-            results.append(
-                {
-                    "rule": rule,
-                    "density": density,
-                    "s_set": rule.split("/S")[1] if "/S" in rule else "",
-                    "s_sum": (
-                        sum(int(c) for c in rule.split("/S")[1] if c.isdigit())
-                        if "/S" in rule
-                        else 0
-                    ),
-                }
-            )
+    # Sample a subset for speed (as indices into the rule table)
+    seed = np.random.SeedSequence(42)
+    rng = np.random.default_rng(seed)
+    sample = rng.choice(len(_ALL_RULES), size=min(100, len(_ALL_RULES)), replace=False)
+    sample_rules = [_ALL_RULES[i] for i in sample]
+
+    # One independent child stream per rule, so results don't depend on
+    # which worker picks up which rule
+    rule_seeds = seed.spawn(len(sample))
+
+    densities = np.empty(len(sample))
+
+    # Each rule is an independent simulation: fan out across cores and
+    # report progress as (ordered) results come back
+    with ProcessPoolExecutor(
+        max_workers=os.cpu_count(), initializer=init_analyzer_worker
+    ) as executor:
+        measured = executor.map(
+            measure_density,
+            sample_rules,
+            repeat(48),
+            repeat(300),
+            rule_seeds,
+            chunksize=4,
+        )
+        for i, density in enumerate(measured):
+            print(f"\r[{i+1}/{len(sample)}] Tested {sample_rules[i]:<20}", end="", flush=True)
+            densities[i] = density
 
     print()
     print()
 
-    # Sort by density
-    results.sort(key=lambda x: x["density"])
+    # Drop failed measurements, then sort by density
+    ok = densities >= 0
+    order = np.argsort(densities[ok], kind="stable")
+    idx = sample[ok][order]
+    densities = densities[ok][order]
+    s_sums = _S_SUMS[idx]
+    s_counts = _S_COUNTS[idx]
+    rules = [_ALL_RULES[i] for i in idx]
 
     # Find the critical zone
     print("═══ LOWEST DENSITY RULES ═══")
@@ -93,38 +121,35 @@ def find_critical_density():
     print(f"{'Rule':<20} {'Density':>10} {'S-sum':>8}")
     print("-" * 40)
 
-    for r in results[:20]:
-        marker = "← CRITICAL?" if r["density"] < 0.25 else ""
-        print(f"{r['rule']:<20} {r['density']*100:>8.1f}% {r['s_sum']:>8} {marker}")
+    for rule, density, s_sum in zip(rules[:20], densities[:20], s_sums[:20], strict=True):
+        marker = "← CRITICAL?" if density < 0.25 else ""
+        print(f"{rule:<20} {density*100:>8.1f}% {s_sum:>8} {marker}")
 
     print()
 
     # Identify the threshold
-    low_density_rules = [r for r in results if r["density"] < 0.25]
+    low = densities < 0.25
 
-    if low_density_rules:
-        min_rule = low_density_rules[0]
-        print(f"📊 MINIMUM DENSITY FOUND: {min_rule['density']*100:.1f}%")
-        print(f"   Rule: {min_rule['rule']}")
+    if low.any():
+        print(f"📊 MINIMUM DENSITY FOUND: {densities[0]*100:.1f}%")
+        print(f"   Rule: {rules[0]}")
         print()
 
         # Analyze what S-combinations give low density
         print("📈 PATTERN ANALYSIS (low-density rules):")
-        s_sums = [r["s_sum"] for r in low_density_rules]
-        s_counts = [len(r["s_set"]) for r in low_density_rules]
-
-        print(f"   Mean S-sum: {np.mean(s_sums):.1f}")
-        print(f"   Mean S-count: {np.mean(s_counts):.1f}")
+        print(f"   Mean S-sum: {s_sums[low].mean():.1f}")
+        print(f"   Mean S-count: {s_counts[low].mean():.1f}")
 
     print()
 
     # Density histogram
-    densities = [r["density"] for r in results]
     print("📊 DENSITY DISTRIBUTION:")
 
     bins = [0, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0]
-    for i in range(len(bins) - 1):
-        count = sum(1 for d in densities if bins[i] <= d < bins[i + 1])
+    # Bins are half-open [lo, hi); np.histogram closes the last one, so
+    # leave out densities at the top edge
+    counts, _ = np.histogram(densities[densities < bins[-1]], bins=bins)
+    for i, count in enumerate(counts.tolist()):
         bar = "█" * count
         print(f"   {bins[i]*100:>3.0f}%-{bins[i+1]*100:<3.0f}%: {bar} ({count})")
 
@@ -134,7 +159,10 @@ def find_critical_density():
     print("   Below this, the membrane cannot remain connected")
     print()
 
-    return results
+    return [
+        {"rule": rule, "density": float(d), "s_set": rule[4:], "s_sum": int(ss)}
+        for rule, d, ss in zip(rules, densities, s_sums, strict=True)
+    ]
 
 
 def main():
@@ -142,8 +170,7 @@ def main():
 
     # Save results
     output_path = Path(__file__).parent.parent / "critical_density_scan.json"
-    with open(output_path, "w") as f:
-        json.dump(results, f, indent=2)
+    write_json(output_path, results)
     print(f"Results saved to {output_path}")
 
 
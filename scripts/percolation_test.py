@@ -13,137 +13,180 @@ The fractal dimension 1.89 may be the universal signature of criticality!
 """
 
 import sys
-from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import numpy as np
+from scipy.ndimage import label
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
+from _workers import get_engine, init_engine_worker
 
-def find_connected_components(grid: np.ndarray) -> list[set]:
-    """Find all connected components in a binary grid using BFS."""
-    h, w = grid.shape
-    visited = np.zeros_like(grid, dtype=bool)
-    components = []
-
-    for i in range(h):
-        for j in range(w):
-            if grid[i, j] == 1 and not visited[i, j]:
-                # BFS to find component
-                component = set()
-                queue = deque([(i, j)])
-                visited[i, j] = True
-
-                while queue:
-                    r, c = queue.popleft()
-                    component.add((r, c))
 
-                    # Check 4-connected neighbors (can also use 8-connected)
-                    for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                        nr, nc = (r + dr) % h, (c + dc) % w
-                        if grid[nr, nc] == 1 and not visited[nr, nc]:
-                            visited[nr, nc] = True
-                            queue.append((nr, nc))
+# 4-connected neighbourhood for component labelling
+_FOUR_CONNECTED = np.array([[0, 1, 0], [1, 1, 1], [0, 1, 0]])
 
-                components.append(component)
-
-    return components
 
+def find_connected_components(grid: np.ndarray) -> list[np.ndarray]:
+    """
+    Find all 4-connected components of a binary grid with periodic
+    boundaries.
 
-def is_spanning(component: set, h: int, w: int) -> tuple[bool, bool]:
+    Labels the grid in C with scipy.ndimage.label, then merges labels that
+    touch across the wrapped edges. Each component is returned as an
+    (k, 2) array of (row, col) coordinates, in order of first cell.
+    """
+    h, w = grid.shape
+    labels, n = label(grid == 1, structure=_FOUR_CONNECTED)
+    if n == 0:
+        return []
+
+    # Union labels that meet across the top/bottom and left/right edges
+    parent = list(range(n + 1))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for a, b in ((labels[0], labels[-1]), (labels[:, 0], labels[:, -1])):
+        both = (a > 0) & (b > 0)
+        for la, lb in set(zip(a[both].tolist(), b[both].tolist(), strict=True)):
+            ra, rb = find(la), find(lb)
+            if ra != rb:
+                parent[max(ra, rb)] = min(ra, rb)
+    roots = np.array([find(x) for x in range(n + 1)])
+
+    # Group cell indices by (root) label; roots are ordered by first cell
+    flat = roots[labels].ravel()
+    cells = np.flatnonzero(flat)
+    cells = cells[np.argsort(flat[cells], kind="stable")]
+    _, starts = np.unique(flat[cells], return_index=True)
+    return [
+        np.column_stack(np.divmod(group, w)) for group in np.split(cells, starts[1:])
+    ]
+
+
+def is_spanning(component: np.ndarray, h: int, w: int) -> tuple[bool, bool]:
     """Check if a component spans horizontally or vertically."""
-    rows = {r for r, c in component}
-    cols = {c for r, c in component}
+    rows = component[:, 0]
+    cols = component[:, 1]
 
-    spans_vertical = 0 in rows and (h - 1) in rows
-    spans_horizontal = 0 in cols and (w - 1) in cols
+    spans_vertical = bool(rows.min() == 0 and rows.max() == h - 1)
+    spans_horizontal = bool(cols.min() == 0 and cols.max() == w - 1)
 
     return spans_horizontal, spans_vertical
 
 
-def estimate_fractal_dimension(component: set, grid_size: int) -> float:
+def estimate_fractal_dimension(component: np.ndarray, grid_size: int) -> float:
     """
-    Estimate fractal dimension using box-counting method.
+    Estimate fractal dimension using the cluster-mass (sandbox) method.
 
-    For a fractal of dimension d_f, the number of boxes N(r) of size r
-    scales as N(r) ~ r^(-d_f)
+    For a fractal of dimension d_f, the mass M(r) of the cluster within
+    radius r of its centre scales as M(r) ~ r^(d_f). Distances use the
+    minimum-image convention, since clusters may wrap around the torus.
     """
     if len(component) < 10:
         return 0.0
 
-    # Convert to numpy array of points
-    # Convert to numpy array of points (unused)
-    # points = np.array(list(component))
+    radii = [2, 4, 8, 16, 32]
+    radii = [r for r in radii if r < grid_size // 2]
 
-    box_sizes = [2, 4, 8, 16, 32]
-    box_sizes = [b for b in box_sizes if b < grid_size // 2]
-
-    if len(box_sizes) < 2:
+    if len(radii) < 2:
         return 2.0  # Trivial case
 
-    log_counts = []
-    log_sizes = []
+    # Centre on the cluster cell nearest its (unwrapped) centroid
+    points = np.asarray(component)
+    center = points[np.argmin(((points - points.mean(axis=0)) ** 2).sum(axis=1))]
 
-    for box_size in box_sizes:
-        # Count unique boxes occupied
-        boxes = set()
-        for r, c in component:
-            boxes.add((r // box_size, c // box_size))
+    delta = np.abs(points - center)
+    delta = np.minimum(delta, grid_size - delta)
+    dist2 = np.sort((delta**2).sum(axis=1))
 
-        log_counts.append(np.log(len(boxes)))
-        log_sizes.append(np.log(1 / box_size))
+    # M(r) for every radius from one sorted pass
+    masses = np.searchsorted(dist2, np.square(radii), side="right")
 
-    # Linear regression: log(N) = d_f * log(1/r) + const
-    if len(log_sizes) >= 2:
-        coeffs = np.polyfit(log_sizes, log_counts, 1)
-        d_f = coeffs[0]
-    else:
-        d_f = 2.0
+    # Linear regression: log(M) = d_f * log(r) + const
+    coeffs = np.polyfit(np.log(radii), np.log(masses), 1)
+    return coeffs[0]
 
-    return d_f
 
+def measure_percolation(rule_str: str, grid_size: int = 64, steps: int = 500) -> dict:
+    """Simulate a rule and measure percolation properties of its final state."""
+    # Run simulation
+    engine = get_engine()
+    engine.set_rule(rule_str)
+    rng = np.random.default_rng(42)
+    final_grid = engine.simulate_final(
+        grid_size, grid_size, steps, "random", density=0.01, rng=rng
+    )
 
-def analyze_percolation(rule_str: str, grid_size: int = 64, steps: int = 500):
-    """Analyze percolation properties of a rule's equilibrium state."""
-    from rulial.engine.totalistic import Totalistic2DEngine
+    # Compute density
+    live = np.count_nonzero(final_grid)
+    result = {
+        "rule": rule_str,
+        "density": live / (grid_size * grid_size),
+        "num_components": 0,
+        "largest_component_size": 0,
+    }
+
+    # Find connected components
+    components = find_connected_components(final_grid)
+    if not components:
+        return result
+
+    largest = max(components, key=len)
+    spans_h, spans_v = is_spanning(largest, grid_size, grid_size)
+    result.update(
+        num_components=len(components),
+        largest_component_size=len(largest),
+        largest_fraction=len(largest) / live,
+        spans_h=spans_h,
+        spans_v=spans_v,
+        percolating=spans_h or spans_v,
+        fractal_dimension=estimate_fractal_dimension(largest, grid_size),
+    )
+    return result
+
+
+def analyze_percolation(
+    rule_str: str, grid_size: int = 64, steps: int = 500, measured: dict = None
+):
+    """
+    Analyze percolation properties of a rule's equilibrium state.
 
+    Pass ``measured`` (from measure_percolation, e.g. computed in a worker
+    process) to only print the report.
+    """
     print(f"🔬 Analyzing: {rule_str}")
     print(f"   Grid: {grid_size}x{grid_size}, Steps: {steps}")
     print()
 
-    # Run simulation
-    engine = Totalistic2DEngine(rule_str)
-    np.random.seed(42)
-    history = engine.simulate(grid_size, grid_size, steps, "random", density=0.01)
-    final_grid = history[-1]
+    if measured is None:
+        measured = measure_percolation(rule_str, grid_size, steps)
+    result = dict(measured)
+    largest_fraction = result.pop("largest_fraction", 0.0)
 
-    # Compute density
-    density = final_grid.sum() / (grid_size * grid_size)
-    print(f"📊 Equilibrium density: {density * 100:.1f}%")
+    print(f"📊 Equilibrium density: {result['density'] * 100:.1f}%")
     print()
 
-    # Find connected components
-    components = find_connected_components(final_grid)
-    components.sort(key=len, reverse=True)
+    print(f"🔗 Connected components: {result['num_components']}")
 
-    print(f"🔗 Connected components: {len(components)}")
-
-    if components:
-        largest = components[0]
+    if result["num_components"]:
         print(
-            f"   Largest component: {len(largest)} cells ({len(largest) / final_grid.sum() * 100:.1f}% of live cells)"
+            f"   Largest component: {result['largest_component_size']} cells ({largest_fraction * 100:.1f}% of live cells)"
         )
 
         # Check spanning
-        spans_h, spans_v = is_spanning(largest, grid_size, grid_size)
-        print(f"   Spans horizontally: {spans_h}")
-        print(f"   Spans vertically: {spans_v}")
-        print(f"   PERCOLATING: {spans_h or spans_v}")
+        print(f"   Spans horizontally: {result['spans_h']}")
+        print(f"   Spans vertically: {result['spans_v']}")
+        print(f"   PERCOLATING: {result['percolating']}")
         print()
 
         # Estimate fractal dimension
-        d_f = estimate_fractal_dimension(largest, grid_size)
+        d_f = result["fractal_dimension"]
         print(f"📐 Estimated fractal dimension: {d_f:.3f}")
         print("   2D percolation threshold: d_f = 91/48 ≈ 1.896")
 
@@ -154,27 +197,26 @@ def analyze_percolation(rule_str: str, grid_size: int = 64, steps: int = 500):
         else:
             print("   🔸 BELOW THRESHOLD (fragmented)")
 
-        return {
-            "rule": rule_str,
-            "density": density,
-            "num_components": len(components),
-            "largest_component_size": len(largest),
-            "spans_h": spans_h,
-            "spans_v": spans_v,
-            "percolating": spans_h or spans_v,
-            "fractal_dimension": d_f,
-        }
+        return result
 
     return None
 
 
-def compare_to_random_lattice(density: float, grid_size: int = 64):
+def compare_to_random_lattice(
+    density: float, grid_size: int = 64, rng: np.random.Generator = None
+):
     """Compare to random lattice at same density (null hypothesis)."""
+    if rng is None:
+        rng = np.random.default_rng()
     print()
     print("═══ RANDOM LATTICE COMPARISON ═══")
     print(f"Testing random lattice at {density*100:.1f}% density...")
 
-    grid = (np.random.random((grid_size, grid_size)) < density).astype(np.uint8)
+    # float32 uniforms are plenty for a threshold and halve the bytes drawn;
+    # the bool mask is reinterpreted as uint8 without a copy
+    grid = (rng.random((grid_size, grid_size), dtype=np.float32) < density).view(
+        np.uint8
+    )
 
     components = find_connected_components(grid)
     components.sort(key=len, reverse=True)
@@ -206,29 +248,30 @@ def main():
     print("Expected fractal dimension at threshold: d_f = 91/48 ≈ 1.896")
     print()
 
-    # Test the minimum-density rule
-    results = []
-
-    # Minimum density rule
-    print("═══ MINIMUM DENSITY RULE ═══")
-    r1 = analyze_percolation("B045678/S015", grid_size=64, steps=500)
-    if r1:
-        results.append(r1)
-    print()
-
-    # A medium-density rule for comparison
-    print("═══ MEDIUM DENSITY RULE ═══")
-    r2 = analyze_percolation("B0457/S2468", grid_size=64, steps=500)
-    if r2:
-        results.append(r2)
-    print()
+    # Minimum density rule, a medium-density rule for comparison, and a
+    # high-density rule
+    test_rules = [
+        ("MINIMUM DENSITY RULE", "B045678/S015"),
+        ("MEDIUM DENSITY RULE", "B0457/S2468"),
+        ("HIGH DENSITY RULE", "B034578/S0345678"),
+    ]
+
+    # The simulations are independent; run them in parallel and print the
+    # reports in order afterwards
+    with ProcessPoolExecutor(
+        max_workers=len(test_rules), initializer=init_engine_worker
+    ) as executor:
+        measured = list(
+            executor.map(measure_percolation, [rule for _, rule in test_rules])
+        )
 
-    # A high-density rule
-    print("═══ HIGH DENSITY RULE ═══")
-    r3 = analyze_percolation("B034578/S0345678", grid_size=64, steps=500)
-    if r3:
-        results.append(r3)
-    print()
+    reports = []
+    for (title, rule), m in zip(test_rules, measured, strict=True):
+        print(f"═══ {title} ═══")
+        reports.append(analyze_percolation(rule, grid_size=64, steps=500, measured=m))
+        print()
+    results = [r for r in reports if r]
+    r1 = reports[0]
 
     # Compare to random
     if r1:
@@ -9,55 +9,89 @@ Usage:
     uv run python scripts/replicate_all.py
 """
 
+import contextlib
+import io
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
 
-def main():
-    print("═══════════════════════════════════════════════════════════")
-    print("  VACUUM CONDENSATE PHASES - FULL REPLICATION")
-    print("═══════════════════════════════════════════════════════════")
-    print()
-    
-    # 1. Condensate Summary
-    print("─── STEP 1: Condensate Scan Summary ───")
+def step_condensate_summary():
     from analysis import condensate_summary
     condensate_summary()
-    print()
-    
-    # 2. S-Parameter Correlation  
-    print("─── STEP 2: S-Parameter Correlation ───")
+    return "ok"
+
+
+def step_s_correlation():
     from analysis import s_correlation
     s_correlation()
-    print()
-    
-    # 3. Control Test (non-B0)
-    print("─── STEP 3: Control Test (Non-B0 Rules) ───")
+    return "ok"
+
+
+def step_control_test():
     from analysis import control_test
     control_test()
-    print()
-    
-    # 4. Universality Test
-    print("─── STEP 4: Universality Test ───")
+    return "ok"
+
+
+def step_universality_test():
     try:
         from rulial.runners.universality_test import run_universality_test
         run_universality_test(samples=10)
     except (ImportError, AttributeError):
         print("  (Skipped - run separately with: uv run python -m rulial.runners.universality_test)")
-    print()
-    
-    # 5. Goldilocks Investigation
-    print("─── STEP 5: Goldilocks Zone Investigation ───")
+        return "skipped"
+    return "ok"
+
+
+def step_goldilocks():
     try:
         from rulial.runners.investigate_particle import investigate_rule
         investigate_rule("B6/S123467", steps=100, grid_size=48)
     except ImportError:
         print("  (Skipped - run separately with: uv run python -m rulial.runners.investigate_particle)")
+        return "skipped"
+    return "ok"
+
+
+STEPS = [
+    ("─── STEP 1: Condensate Scan Summary ───", step_condensate_summary),
+    ("─── STEP 2: S-Parameter Correlation ───", step_s_correlation),
+    ("─── STEP 3: Control Test (Non-B0 Rules) ───", step_control_test),
+    ("─── STEP 4: Universality Test ───", step_universality_test),
+    ("─── STEP 5: Goldilocks Zone Investigation ───", step_goldilocks),
+]
+
+
+def _run_step(step):
+    """Run one step in a worker, capturing its output as (status, text)."""
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        status = step()
+    return status, out.getvalue()
+
+
+def main():
+    print("═══════════════════════════════════════════════════════════")
+    print("  VACUUM CONDENSATE PHASES - FULL REPLICATION")
+    print("═══════════════════════════════════════════════════════════")
     print()
     
+    # Steps 1-5 are independent (three atlas reads, two simulations):
+    # run them all at once and print each step's output in order
+    statuses = {}
+    with ProcessPoolExecutor(max_workers=len(STEPS)) as executor:
+        futures = [executor.submit(_run_step, step) for _, step in STEPS]
+        for (title, _), future in zip(STEPS, futures, strict=True):
+            status, output = future.result()
+            statuses[title] = status
+            print(title)
+            print(output, end="")
+            print()
+    
     # 6. Summary
     print("═══════════════════════════════════════════════════════════")
     print("  REPLICATION COMPLETE")
@@ -70,6 +104,12 @@ def main():
     print("  ✓ Universality extends to non-totalistic rules")
     print("  ✓ Goldilocks zone (H=0.3-0.6) contains gliders")
     print()
+    skipped = [title for title, status in statuses.items() if status == "skipped"]
+    if skipped:
+        print("Skipped steps:")
+        for title in skipped:
+            print(f"  {title.strip('─ ')}")
+        print()
     print("For full analysis, see:")
     print("  - docs/Whitepaper-Vacuum-Condensate-Phases.md")
     print("  - docs/RESEARCH_STATUS.md")
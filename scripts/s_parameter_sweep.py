@@ -8,9 +8,9 @@ to identify phase transitions and density jumps.
 Goal: Find where the 58% density jump occurs and what structures change.
 """
 
-import json
+import os
 import sys
-from itertools import combinations
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
 import matplotlib.pyplot as plt
@@ -18,41 +18,66 @@ import numpy as np
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from rulial.mapper.condensate import VacuumCondensateAnalyzer
+from _cache import AnalysisCache
+from _rules import s_set_to_sum as s_set_to_sum
+from _rules import write_json
+from _workers import get_analyzer, init_analyzer_worker
 
+# Cache namespace for sweep measurements; bump when the analysis changes
+CACHE_KIND = "VacuumCondensateAnalyzer/v1"
+SWEEP_SEED = 42
 
-def s_set_to_sum(s_str: str) -> int:
-    """Convert S-set string to sum of digits."""
-    return sum(int(c) for c in s_str if c.isdigit())
+
+# S-set string for every 9-bit survival mask (bit d set <=> digit d in S)
+_S_STR_FOR_MASK = np.array(
+    ["".join(str(d) for d in range(9) if (m >> d) & 1) for m in range(512)]
+)
 
 
 def generate_systematic_sweep():
     """Generate B0 rules with increasing S-complexity."""
-    rules = []
-    digits = "012345678"
-
-    # Generate all possible S-sets and sort by sum
-    for r in range(10):
-        for combo in combinations(digits, r):
-            s_str = "".join(combo)
-            s_sum = sum(int(c) for c in s_str)
-            rules.append(
-                {
-                    "rule": f"B0/S{s_str}" if s_str else "B0/S",
-                    "s_str": s_str,
-                    "s_sum": s_sum,
-                    "s_count": len(s_str),
-                }
-            )
+    # Every S-set as a bitmask; digit sums and counts in one pass
+    bits = (np.arange(512)[:, None] >> np.arange(9)) & 1
+    s_sums = bits @ np.arange(9)
+    s_counts = bits.sum(axis=1)
+
+    # Sort by S-sum for systematic sweep (then S-count, then the S-set
+    # itself, which is the order combinations() would produce them in)
+    order = np.lexsort((_S_STR_FOR_MASK, s_counts, s_sums))
+
+    return [
+        {
+            "rule": f"B0/S{s_str}" if s_str else "B0/S",
+            "s_str": s_str,
+            "s_sum": s_sum,
+            "s_count": s_count,
+        }
+        for s_str, s_sum, s_count in zip(
+            _S_STR_FOR_MASK[order].tolist(),
+            s_sums[order].tolist(),
+            s_counts[order].tolist(),
+            strict=True,
+        )
+    ]
 
-    # Sort by S-sum for systematic sweep
-    rules.sort(key=lambda x: (x["s_sum"], x["s_count"]))
 
-    return rules
+def _analyze_one(rule_str: str, seed: np.random.SeedSequence) -> dict:
+    """Measure one sweep rule in a worker."""
+    result = get_analyzer(48, 300).analyze(rule_str, rng=np.random.default_rng(seed))
+    return {
+        "density": float(result.equilibrium_density),
+        "expansion": int(result.expansion_factor),
+        "is_condensate": bool(result.is_condensate),
+    }
 
 
-def run_sweep(sample_size: int = 80):
-    """Run the S-parameter sweep."""
+def run_sweep(sample_size: int = 80, use_cache: bool = True):
+    """
+    Run the S-parameter sweep.
+
+    Measurements are memoized on disk (see scripts/_cache.py), so rules
+    already measured by an earlier run are not simulated again.
+    """
     print("╔══════════════════════════════════════════════════════════╗")
     print("║   S-PARAMETER SWEEP: PHASE TRANSITION ANALYSIS           ║")
     print("╚══════════════════════════════════════════════════════════╝")
@@ -62,27 +87,59 @@ def run_sweep(sample_size: int = 80):
     print(f"Total possible B0 rules: {len(all_rules)}")
 
     # Sample uniformly across S-sum range
-    np.random.seed(42)
     indices = np.linspace(0, len(all_rules) - 1, sample_size, dtype=int)
     sample_rules = [all_rules[i] for i in indices]
 
     print(f"Sampling {len(sample_rules)} rules across S-sum range")
     print()
 
-    analyzer = VacuumCondensateAnalyzer(grid_size=48, steps=300)
-    results = []
-
-    for i, r in enumerate(sample_rules):
-        print(f"\r[{i+1}/{len(sample_rules)}] {r['rule']:<20}", end="", flush=True)
-
-        try:
-            result = analyzer.analyze(r["rule"])
-            r["density"] = result.equilibrium_density
-            r["expansion"] = result.expansion_factor
-            r["is_condensate"] = result.is_condensate
-            results.append(r)
-        except Exception as e:
-            print(f" ERROR: {e}")
+    # One random stream per rule, keyed by its position in the full rule
+    # list: independent of worker scheduling and of sample_size, so a
+    # cached measurement is the one this run would have made
+    rule_seeds = [
+        np.random.SeedSequence(SWEEP_SEED, spawn_key=(int(i),)) for i in indices
+    ]
+    cache_keys = [f"{r['rule']}|48|300|{SWEEP_SEED}" for r in sample_rules]
+    measured = [None] * len(sample_rules)
+
+    cache = AnalysisCache() if use_cache else None
+    pending = []
+    for i, (r, key) in enumerate(zip(sample_rules, cache_keys, strict=True)):
+        hit = cache.get(CACHE_KIND, key) if cache else None
+        if hit is None:
+            pending.append(i)
+        else:
+            measured[i] = {**r, **hit}
+    if len(pending) < len(sample_rules):
+        print(f"Reusing {len(sample_rules) - len(pending)} cached measurements")
+
+    # Rules are independent simulations: fan out across cores and take
+    # them as they finish (per-rule runtimes vary a lot)
+    with ProcessPoolExecutor(
+        max_workers=os.cpu_count(), initializer=init_analyzer_worker
+    ) as executor:
+        futures = {
+            executor.submit(_analyze_one, sample_rules[i]["rule"], rule_seeds[i]): i
+            for i in pending
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            i = futures[future]
+            rule = sample_rules[i]["rule"]
+            print(f"\r[{done}/{len(pending)}] {rule:<20}", end="", flush=True)
+            try:
+                measurement = future.result()
+            except Exception as e:
+                print(f" ERROR: {e}")
+                continue
+            measured[i] = {**sample_rules[i], **measurement}
+            if cache:
+                cache.put(CACHE_KIND, cache_keys[i], measurement)
+
+    if cache:
+        cache.close()
+
+    # Back in sample order, so ties in the later S-sum sort are stable
+    results = [r for r in measured if r is not None]
 
     print()
     print()
@@ -219,8 +276,7 @@ def main():
 
     # Save results
     output_path = Path(__file__).parent.parent / "s_parameter_sweep.json"
-    with open(output_path, "w") as f:
-        json.dump(results, f, indent=2)
+    write_json(output_path, results)
     print(f"Results saved to {output_path}")
 
     print()
@@ -16,31 +16,119 @@ Usage:
 import sys
 import os
 import random
-from contextlib import redirect_stdout
-import io
+import functools
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
+from _cache import AnalysisCache
+
+# Cache namespaces; bump the version when the analysis changes
+SHEAF_KIND = "SheafAnalyzer/v1"
+INVESTIGATE_KIND = "investigate_rule/v1"
+
+
+@functools.lru_cache(maxsize=None)
+def get_sheaf_analyzer():
+    """One SheafAnalyzer per process, so its cached grid graph and spectra
+    are reused across rules."""
+    from rulial.mapper.sheaf import SheafAnalyzer
+    return SheafAnalyzer(grid_size=32, steps=50)
+
+
+def _init_worker():
+    """Per-worker setup: build the analyzer and give the worker its own
+    NumPy stream (forked workers would otherwise replay the parent's)."""
+    np.random.seed()
+    get_sheaf_analyzer()
+
+
+# Digit strings of every B/S subset of 0-8, grouped by subset size
+_DIGITS_BY_COUNT = [[] for _ in range(10)]
+for _mask in range(512):
+    _digits = "".join(str(d) for d in range(9) if (_mask >> d) & 1)
+    _DIGITS_BY_COUNT[len(_digits)].append(_digits)
+
 
-def stress_test(target_samples: int = 20, verbose: bool = True):
+def random_rules():
+    """Endless stream of random totalistic rule strings: 1-4 birth and 1-5
+    survival digits, each subset uniform among those of its size."""
+    while True:
+        b = random.choice(_DIGITS_BY_COUNT[random.randint(1, 4)])
+        s = random.choice(_DIGITS_BY_COUNT[random.randint(1, 5)])
+        yield f"B{b}/S{s}"
+
+
+def _screen_rule(rule_str: str):
+    """Sheaf pre-filter for one rule: (rule, H, Φ), or None if analysis fails."""
+    try:
+        res = get_sheaf_analyzer().analyze(rule_str)
+    except Exception:
+        return None
+    return rule_str, res.harmonic_overlap, res.monodromy_index
+
+
+def _investigate(rule_str: str):
+    """
+    Quiet glider verification for one rule. Returns the structure census,
+    or None if it failed.
+    """
+    from rulial.runners.investigate_particle import investigate_rule
+
+    try:
+        return investigate_rule(rule_str, steps=150, grid_size=48, verbose=False)
+    except Exception:
+        return None
+
+
+def _cached_map(executor, fn, rules, cache, kind, params, memo, chunksize=1):
+    """
+    Map fn over rules in the pool, answering from the in-session memo and
+    the on-disk cache where possible and storing new results. Results come
+    back in input order. memo is a dict shared across calls for one run, so
+    a rule drawn twice (even within one batch, or with the disk cache off)
+    is computed once. fn must not raise; None results are memoized for the
+    session but not cached on disk.
+    """
+    keys = [rule_str + params for rule_str in rules]
+    misses = {}
+    for rule_str, key in zip(rules, keys, strict=True):
+        if (kind, key) in memo or key in misses:
+            continue
+        value = cache.get(kind, key) if cache else None
+        if value is None:
+            misses[key] = rule_str
+        else:
+            memo[kind, key] = value
+    
+    computed = executor.map(fn, list(misses.values()), chunksize=chunksize)
+    for key, value in zip(misses, computed, strict=True):
+        memo[kind, key] = value
+        if cache and value is not None:
+            cache.put(kind, key, value)
+    return [memo[kind, key] for key in keys]
+
+
+def stress_test(target_samples: int = 20, verbose: bool = True, use_cache: bool = True):
     """
     Stress test the Goldilocks Zone hypothesis.
     
     For each rule in 0.3 < H < 0.6:
     - Check for gliders, oscillators, or still lifes
     - Compute precision (true positive rate)
-    """
-    from rulial.mapper.sheaf import SheafAnalyzer
-    from rulial.runners.investigate_particle import investigate_rule
     
+    Sheaf and structure results are memoized on disk (scripts/_cache.py)
+    so rules seen in earlier runs are not re-simulated, and in memory so
+    rules drawn twice in this run are only simulated once.
+    """
     print("🕵️ GOLDILOCKS ZONE STRESS TEST")
     print(f"Target: {target_samples} rules with 0.3 < H < 0.6")
     print("Verifying each for computational structures...")
     print()
     
-    analyzer = SheafAnalyzer(grid_size=32, steps=50)
-    
     found_goldilocks = 0
     verified_computational = 0
     partial_computational = 0
@@ -49,36 +137,49 @@ def stress_test(target_samples: int = 20, verbose: bool = True):
     max_attempts = target_samples * 50  # Prevent infinite loop
     
     results = []
+    candidates = []
+    rules = random_rules()
+    cache = AnalysisCache() if use_cache else None
+    memo = {}
+    workers = os.cpu_count() or 1
     
-    while found_goldilocks < target_samples and tested_rules < max_attempts:
-        tested_rules += 1
-        
-        # Generate random totalistic rule
-        b = "".join([str(x) for x in sorted(random.sample(range(9), random.randint(1, 4)))])
-        s = "".join([str(x) for x in sorted(random.sample(range(9), random.randint(1, 5)))])
-        rule_str = f"B{b}/S{s}"
-        
-        # Sheaf analysis
-        try:
-            res = analyzer.analyze(rule_str)
-        except Exception:
-            continue
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        # Phase 1: sheaf pre-filter, a batch of random rules at a time,
+        # consumed in generation order until the target is reached
+        while found_goldilocks < target_samples and tested_rules < max_attempts:
+            batch_size = min(8 * workers, max_attempts - tested_rules)
+            batch = [next(rules) for _ in range(batch_size)]
+            screened_batch = _cached_map(
+                executor, _screen_rule, batch, cache, SHEAF_KIND, "|32|50", memo, chunksize=8
+            )
+            for screened in screened_batch:
+                tested_rules += 1
+                
+                # Check if in Goldilocks Zone
+                if screened is not None and 0.3 <= screened[1] <= 0.6:
+                    found_goldilocks += 1
+                    candidates.append(screened)
+                    if found_goldilocks == target_samples:
+                        break
         
-        h = res.harmonic_overlap
-        phi = res.monodromy_index
+        # Phase 2: glider verification of the confirmed candidates
+        verified = _cached_map(
+            executor,
+            _investigate,
+            [rule_str for rule_str, _, _ in candidates],
+            cache,
+            INVESTIGATE_KIND,
+            "|150|48",
+            memo,
+        )
         
-        # Check if in Goldilocks Zone
-        if 0.3 <= h <= 0.6:
-            found_goldilocks += 1
-            
+        for i, ((rule_str, h, phi), structs) in enumerate(zip(candidates, verified, strict=True), start=1):
             if verbose:
-                print(f"[{found_goldilocks:2d}/{target_samples}] {rule_str:15s} H={h:.3f} Φ={phi:+.1f}", end=" ")
+                print(f"[{i:2d}/{target_samples}] {rule_str:15s} H={h:.3f} Φ={phi:+.1f}", end=" ")
             
-            # Glider verification (suppress output)
-            f = io.StringIO()
             try:
-                with redirect_stdout(f):
-                    structs = investigate_rule(rule_str, steps=150, grid_size=48)
+                if structs is None:
+                    raise RuntimeError("structure census failed")
                 
                 gliders = structs.get('gliders', 0)
                 oscillators = structs.get('oscillators', 0)
@@ -112,6 +213,9 @@ def stress_test(target_samples: int = 20, verbose: bool = True):
                     print(f"⚠️ Error: {e}")
                 false_positives += 1
     
+    if cache:
+        cache.close()
+    
     # Summary
     print()
     print("═══ STRESS TEST RESULTS ═══")
@@ -152,9 +256,10 @@ def main():
     parser = argparse.ArgumentParser(description="Stress test the Goldilocks Zone hypothesis")
     parser.add_argument("--samples", type=int, default=20, help="Number of Goldilocks rules to test")
     parser.add_argument("--quiet", action="store_true", help="Suppress per-rule output")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and don't update the on-disk result cache")
     args = parser.parse_args()
     
-    stress_test(target_samples=args.samples, verbose=not args.quiet)
+    stress_test(target_samples=args.samples, verbose=not args.quiet, use_cache=not args.no_cache)
 
 
 if __name__ == "__main__":
@@ -7,10 +7,10 @@ Creates figures for the whitepaper:
 3. S-sum correlation plot
 """
 
-import json
+import functools
+import os
 import sys
-from collections import defaultdict
-from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 
 import numpy as np
 
@@ -21,18 +21,51 @@ except ImportError:
     HAS_MATPLOTLIB = False
     print("Warning: matplotlib not installed. Install with: uv pip install matplotlib")
 
+from _cache import AnalysisCache
+from _rules import atlas_table
+from analysis import load_atlas_arrays
 
-def load_atlas(filename: str) -> list:
-    """Load atlas data."""
-    path = Path(filename)
-    if not path.exists():
-        print(f"Error: {filename} not found")
-        sys.exit(1)
-    with open(path) as f:
-        return json.load(f)
+# Same cache namespace (and [rule, H, Φ] entries) as stress_test_goldilocks
+SHEAF_KIND = "SheafAnalyzer/v1"
 
+# Pie colour per T-P+E mode; anything else is drawn gray
+TPE_COLORS = {'balanced': 'steelblue', 'P-dominant': 'coral', 'T-dominant': 'gold', 'dead': 'gray'}
 
-def plot_equilibrium_by_s_count(data: list, output: str = "fig_equilibrium_by_s_count.png"):
+
+def sheaf_metrics(analyzer, rule: str, cache: AnalysisCache):
+    """
+    (harmonic_overlap, monodromy_index) of rule under analyzer, memoized on
+    disk by (rule, grid_size, steps) so regenerating figures does not
+    re-simulate. Analysis errors propagate and are not cached.
+    """
+    key = f"{rule}|{analyzer.grid_size}|{analyzer.steps}"
+    hit = cache.get(SHEAF_KIND, key)
+    if hit is None:
+        result = analyzer.analyze(rule)
+        hit = [rule, result.harmonic_overlap, result.monodromy_index]
+        cache.put(SHEAF_KIND, key, hit)
+    return hit[1], hit[2]
+
+
+@functools.lru_cache(maxsize=None)
+def _sheaf_analyzer(grid: int, steps: int):
+    """One SheafAnalyzer per (grid, steps) per process, so its cached grid
+    graph and spectra are reused across rules."""
+    from rulial.mapper.sheaf import SheafAnalyzer
+    return SheafAnalyzer(grid_size=grid, steps=steps)
+
+
+def _analyze_one(rule: str, grid: int, steps: int):
+    """Pool worker: [rule, H, Φ] for one rule (a SHEAF_KIND cache entry),
+    or None if the analysis fails."""
+    try:
+        result = _sheaf_analyzer(grid, steps).analyze(rule)
+    except Exception:
+        return None
+    return [rule, result.harmonic_overlap, result.monodromy_index]
+
+
+def plot_equilibrium_by_s_count(table: dict, output: str = "fig_equilibrium_by_s_count.png"):
     """
     Figure: Equilibrium Density by S-Count
     Bar chart showing how S-count affects vacuum energy.
@@ -40,24 +73,25 @@ def plot_equilibrium_by_s_count(data: list, output: str = "fig_equilibrium_by_s_
     if not HAS_MATPLOTLIB:
         return
     
-    # Group by S-count
-    by_count = defaultdict(list)
-    for r in data:
-        s_count = len(r['s_set']) if r['s_set'] else 0
-        by_count[s_count].append(r['equilibrium_density'])
+    s_counts = table["s_count"]
+    eqs = table["eq_density"]
     
-    counts = sorted(by_count.keys())
-    means = [np.mean(by_count[c]) for c in counts]
-    stds = [np.std(by_count[c]) for c in counts]
-    ns = [len(by_count[c]) for c in counts]
+    # Group by S-count: per-bucket n, sum and sum of squares via bincount
+    ns = np.bincount(s_counts)
+    sums = np.bincount(s_counts, weights=eqs)
+    sqs = np.bincount(s_counts, weights=eqs * eqs)
+    
+    counts = np.flatnonzero(ns)
+    ns = ns[counts]
+    means = sums[counts] / ns
+    # Population std (as np.std); clip rounding noise below zero
+    stds = np.sqrt(np.maximum(sqs[counts] / ns - means**2, 0.0))
     
     fig, ax = plt.subplots(figsize=(10, 6))
     bars = ax.bar(counts, means, yerr=stds, capsize=5, color='steelblue', alpha=0.8)
     
-    # Add count labels
-    for bar, n in zip(bars, ns, strict=True):
-        ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.02, 
-                f'n={n}', ha='center', va='bottom', fontsize=9)
+    # Add count labels (above each error bar)
+    ax.bar_label(bars, labels=[f'n={n}' for n in ns], padding=3, fontsize=9)
     
     ax.set_xlabel('S-count (number of survival conditions)', fontsize=12)
     ax.set_ylabel('Mean Equilibrium Density', fontsize=12)
@@ -71,7 +105,7 @@ def plot_equilibrium_by_s_count(data: list, output: str = "fig_equilibrium_by_s_
     plt.close()
 
 
-def plot_s_sum_correlation(data: list, output: str = "fig_s_sum_correlation.png"):
+def plot_s_sum_correlation(table: dict, output: str = "fig_s_sum_correlation.png"):
     """
     Figure: S-Sum vs Equilibrium Density Scatter
     Shows the r=0.621 correlation.
@@ -79,24 +113,17 @@ def plot_s_sum_correlation(data: list, output: str = "fig_s_sum_correlation.png"
     if not HAS_MATPLOTLIB:
         return
     
-    s_sums = []
-    eq_densities = []
-    
-    for r in data:
-        s_set = r['s_set']
-        s_digits = [int(c) for c in s_set] if s_set else []
-        s_sum = sum(s_digits)
-        s_sums.append(s_sum)
-        eq_densities.append(r['equilibrium_density'])
+    sums = table["s_sum"]
+    eq_densities = table["eq_density"]
     
     fig, ax = plt.subplots(figsize=(10, 6))
-    ax.scatter(s_sums, eq_densities, alpha=0.6, s=50, c='steelblue')
+    ax.scatter(sums, eq_densities, alpha=0.6, s=50, c='steelblue')
     
     # Regression line
-    z = np.polyfit(s_sums, eq_densities, 1)
+    z = np.polyfit(sums, eq_densities, 1)
     p = np.poly1d(z)
-    x_line = np.linspace(min(s_sums), max(s_sums), 100)
-    ax.plot(x_line, p(x_line), 'r-', linewidth=2, label=f'r = {np.corrcoef(s_sums, eq_densities)[0,1]:.3f}')
+    x_line = np.linspace(sums.min(), sums.max(), 100)
+    ax.plot(x_line, p(x_line), 'r-', linewidth=2, label=f'r = {np.corrcoef(sums, eq_densities)[0,1]:.3f}')
     
     ax.set_xlabel('S-sum (sum of survival condition digits)', fontsize=12)
     ax.set_ylabel('Equilibrium Density', fontsize=12)
@@ -110,7 +137,7 @@ def plot_s_sum_correlation(data: list, output: str = "fig_s_sum_correlation.png"
     plt.close()
 
 
-def plot_tpe_modes(data: list, output: str = "fig_tpe_modes.png"):
+def plot_tpe_modes(table: dict, output: str = "fig_tpe_modes.png"):
     """
     Figure: T-P+E Mode Distribution
     Pie chart showing balanced vs P-dominant.
@@ -118,13 +145,14 @@ def plot_tpe_modes(data: list, output: str = "fig_tpe_modes.png"):
     if not HAS_MATPLOTLIB:
         return
     
-    from collections import Counter
-    modes = Counter(r['tpe_mode'] for r in data)
-    
-    labels = list(modes.keys())
-    sizes = list(modes.values())
-    colors = {'balanced': 'steelblue', 'P-dominant': 'coral', 'T-dominant': 'gold', 'dead': 'gray'}
-    c = [colors.get(label, 'gray') for label in labels]
+    # Sort-and-count in C; wedges stay in order of first appearance
+    modes, first, counts = np.unique(
+        table["tpe_mode"], return_index=True, return_counts=True
+    )
+    order = np.argsort(first)
+    labels = modes[order].tolist()
+    sizes = counts[order].tolist()
+    c = [TPE_COLORS.get(label, 'gray') for label in labels]
     
     fig, ax = plt.subplots(figsize=(8, 8))
     wedges, texts, autotexts = ax.pie(sizes, labels=labels, autopct='%1.1f%%', 
@@ -164,14 +192,8 @@ def plot_phase_comparison(output: str = "fig_phase_comparison.png"):
     ax.legend(fontsize=11)
     
     # Add value labels
-    for bar in bars1:
-        ax.text(bar.get_x() + bar.get_width()/2, bar.get_height(), 
-                f'{bar.get_height():.0f}' if bar.get_height() >= 1 else f'{bar.get_height():.0%}',
-                ha='center', va='bottom', fontsize=10)
-    for bar in bars2:
-        ax.text(bar.get_x() + bar.get_width()/2, bar.get_height(),
-                f'{bar.get_height():.0f}' if bar.get_height() >= 1 else f'{bar.get_height():.0%}',
-                ha='center', va='bottom', fontsize=10)
+    for bars in (bars1, bars2):
+        ax.bar_label(bars, fmt=lambda h: f'{h:.0f}' if h >= 1 else f'{h:.0%}', fontsize=10)
     
     plt.tight_layout()
     plt.savefig(output, dpi=150)
@@ -204,6 +226,7 @@ def plot_goldilocks_zone(output: str = "fig_goldilocks_zone.png"):
     
     print("Computing sheaf metrics for Goldilocks plot...")
     analyzer = SheafAnalyzer(grid_size=24, steps=40)
+    cache = AnalysisCache()
     
     h_values = []
     mono_values = []
@@ -212,13 +235,14 @@ def plot_goldilocks_zone(output: str = "fig_goldilocks_zone.png"):
     
     for rule, name in rules:
         try:
-            result = analyzer.analyze(rule)
-            h_values.append(result.harmonic_overlap)
-            mono_values.append(result.monodromy_index)
+            h, mono = sheaf_metrics(analyzer, rule, cache)
+            h_values.append(h)
+            mono_values.append(mono)
             names.append(name)
-            is_goldilocks.append(0.3 < result.harmonic_overlap < 0.6)
+            is_goldilocks.append(0.3 < h < 0.6)
         except Exception as e:
             print(f"  Skipping {rule}: {e}")
+    cache.close()
     
     fig, ax = plt.subplots(figsize=(12, 8))
     
@@ -280,26 +304,38 @@ def plot_monodromy_histogram(output: str = "fig_monodromy_histogram.png"):
     if not HAS_MATPLOTLIB:
         return
     
-    from rulial.mapper.sheaf import SheafAnalyzer
     import random
     
     print("Computing monodromy for histogram...")
-    analyzer = SheafAnalyzer(grid_size=20, steps=30)
+    grid, steps = 20, 30
+    cache = AnalysisCache()
+    # Fixed seed: the same 30 rules every run, so they hit the cache
+    rng = random.Random(42)
     
-    monos = []
+    rules = []
     for i in range(30):
         # Generate random rule
-        b_digits = ''.join(str(d) for d in range(9) if random.random() < 0.4)
-        s_digits = ''.join(str(d) for d in range(9) if random.random() < 0.5)
+        b_digits = ''.join(str(d) for d in range(9) if rng.random() < 0.4)
+        s_digits = ''.join(str(d) for d in range(9) if rng.random() < 0.5)
         if not b_digits:
-            b_digits = str(random.randint(0, 8))
-        rule = f"B{b_digits}/S{s_digits}"
-        
-        try:
-            result = analyzer.analyze(rule)
-            monos.append(result.monodromy_index)
-        except Exception:
-            pass
+            b_digits = str(rng.randint(0, 8))
+        rules.append(f"B{b_digits}/S{s_digits}")
+    
+    # Cache hits are answered here; the misses are independent, CPU-bound
+    # sheaf simulations, so they run across a process pool
+    keys = [f"{rule}|{grid}|{steps}" for rule in rules]
+    entries = [cache.get(SHEAF_KIND, key) for key in keys]
+    misses = [i for i, entry in enumerate(entries) if entry is None]
+    if misses:
+        worker = functools.partial(_analyze_one, grid=grid, steps=steps)
+        with ProcessPoolExecutor(max_workers=min(len(misses), os.cpu_count() or 1)) as ex:
+            for i, entry in zip(misses, ex.map(worker, [rules[i] for i in misses]), strict=True):
+                entries[i] = entry
+                if entry is not None:
+                    cache.put(SHEAF_KIND, keys[i], entry)
+    cache.close()
+    
+    monos = [entry[2] for entry in entries if entry is not None]
     
     fig, ax = plt.subplots(figsize=(10, 6))
     
@@ -327,12 +363,14 @@ def generate_all(atlas_file: str = "atlas_v4_condensate.json"):
         print("Error: matplotlib required. Install with: uv pip install matplotlib")
         return
     
-    data = load_atlas(atlas_file)
+    # Columnar load: analysis.py's .npy projection of the atlas, rebuilt
+    # only when the JSON changes
+    table = atlas_table(load_atlas_arrays(atlas_file))
     
     # Original plots
-    plot_equilibrium_by_s_count(data)
-    plot_s_sum_correlation(data)
-    plot_tpe_modes(data)
+    plot_equilibrium_by_s_count(table)
+    plot_s_sum_correlation(table)
+    plot_tpe_modes(table)
     plot_phase_comparison()
     
     # New Goldilocks plots
@@ -3,6 +3,40 @@ import sqlite3
 from dataclasses import dataclass
 from typing import Dict, List
 
+import numpy as np
+
+# Canonical digit string of every 9-bit B/S mask, and its inverse
+_MASK_DIGITS = ["".join(str(d) for d in range(9) if (m >> d) & 1) for m in range(512)]
+_DIGITS_MASK = {digits: m for m, digits in enumerate(_MASK_DIGITS)}
+
+
+def _digits_to_mask(digits: str) -> int:
+    """Bitmask of the digit characters in digits (bit d <=> digit d)."""
+    mask = 0
+    for c in digits:
+        if c.isdigit():
+            mask |= 1 << int(c)
+    return mask
+
+
+def _mask_to_digits(mask: int) -> str:
+    """Sorted digit string of mask; bit 9 only arises from a stray '9'."""
+    return _MASK_DIGITS[mask & 511] + ("9" if mask & 512 else "")
+
+
+def _rule_to_bits(rule_str: str) -> int:
+    """
+    18-bit code of a canonical rule string (bits 0-8 = B, 9-17 = S), or -1
+    if the string is not in the sorted-digit form _generate_neighbors emits.
+    """
+    b_part, _, s_part = rule_str.partition("/")
+    if b_part[:1] == "B" and s_part[:1] == "S":
+        b = _DIGITS_MASK.get(b_part[1:])
+        s = _DIGITS_MASK.get(s_part[1:])
+        if b is not None and s is not None:
+            return b | (s << 9)
+    return -1
+
 
 @dataclass
 class RuleStats:
@@ -65,74 +99,85 @@ class RuliadAnalyzer:
         """
         print(f"Exporting N-Quads to {output_path}...")
 
-        # Get all vectors/rules to build graph
-        # For simplicity, we define neighbors as rules with Hamming distance 1
-        # BUT calculating that for 158k rules is O(N^2) - too slow.
-        # Instead, we just export the properties we know.
-
-        # If we really want the graph, we need to know WHO connects to WHO.
-        # Since we don't store edges explicitly, we can generate them for the known set.
-        # For 158k rules, we can iterate and generate neighbors, check if neighbor exists.
+        # Edges connect rules at Hamming distance 1 (one B or S digit
+        # flipped) when both were scanned. Rules are encoded as 18-bit
+        # codes, so each rule's neighbours are code ^ (1 << k): one
+        # vectorized XOR + membership test per bit instead of building and
+        # probing 18 neighbour strings per rule.
 
+        # Plain tuples streamed straight into the dict: no sqlite3.Row per
+        # rule and no intermediate fetchall() list
         cursor = self.conn.cursor()
+        cursor.row_factory = None
         cursor.execute("SELECT rule_str, harmonic_overlap FROM explorations")
-        rules = {row["rule_str"]: row["harmonic_overlap"] for row in cursor.fetchall()}
+        rules = dict(cursor)
 
-        known_set = set(rules.keys())
-
-        with gzip.open(output_path, "wt") as f:
-            for rule, h in rules.items():
+        names = list(rules)
+        bits = np.fromiter(
+            (_rule_to_bits(r) for r in names), dtype=np.int64, count=len(names)
+        )
+        canonical = bits >= 0
+        # Neighbours are emitted in canonical form, so only canonical rules
+        # can be matched as neighbours. Binary search over their sorted
+        # codes (plus a sentinel above every code, so positions stay in
+        # range) gives membership and the neighbour's row in one pass.
+        canon_rows = np.flatnonzero(canonical)
+        order = np.argsort(bits[canon_rows])
+        sorted_bits = np.append(bits[canon_rows][order], np.iinfo(np.int64).max)
+        sorted_rows = canon_rows[order]
+        flips = bits[:, None] ^ (np.int64(1) << np.arange(18, dtype=np.int64))
+        pos = np.searchsorted(sorted_bits, flips)
+        has_edge = (sorted_bits[pos] == flips) & canonical[:, None]
+
+        # Edge targets flattened in (rule, bit) order, with per-rule ends
+        targets = sorted_rows[pos[has_edge]].tolist()
+        ends = np.cumsum(has_edge.sum(axis=1)).tolist()
+        canonical = canonical.tolist()
+
+        # Only the string fallback below needs a set of names
+        known_set = set(names) if not all(canonical) else None
+
+        # Deflate dominates the export time: compresslevel 1 is ~15x faster
+        # than Python's default of 9 on this text, for a ~60% larger file
+        with gzip.open(output_path, "wt", compresslevel=1) as f:
+            start = 0
+            for i, (rule, h) in enumerate(rules.items()):
                 # 1. Node properties
                 # <rule:B3/S23> <pred:type> <obj:Rule>
-                f.write(f"<rule:{rule}> <pred:type> <obj:Rule> .\n")
-
                 # <rule:B3/S23> <pred:harmonic_overlap> "0.5000"
-                f.write(f'<rule:{rule}> <pred:harmonic_overlap> "{h:.4f}" .\n')
-
-                # 2. Edges (Hamming neighbors)
-                neighbors = self._generate_neighbors(rule)
+                lines = [
+                    f"<rule:{rule}> <pred:type> <obj:Rule> .\n",
+                    f'<rule:{rule}> <pred:harmonic_overlap> "{h:.4f}" .\n',
+                ]
+
+                # 2. Edges (Hamming neighbors), B bits 0-8 then S bits 0-8
+                if canonical[i]:
+                    neighbors = [names[j] for j in targets[start : ends[i]]]
+                else:
+                    # Non-canonical spelling: fall back to string neighbours
+                    neighbors = [
+                        n for n in self._generate_neighbors(rule) if n in known_set
+                    ]
+                start = ends[i]
                 for n in neighbors:
-                    if n in known_set:
-                        # <rule:A> <pred:connected_to> <rule:B>
-                        f.write(f"<rule:{rule}> <pred:connected_to> <rule:{n}> .\n")
+                    # <rule:A> <pred:connected_to> <rule:B>
+                    lines.append(f"<rule:{rule}> <pred:connected_to> <rule:{n}> .\n")
+
+                f.write("".join(lines))
 
     def _generate_neighbors(self, rule_str: str) -> List[str]:
         """Generate 18 Hamming neighbors for a rule string."""
-        # This duplicates logic in pipeline but is pure string manipul for safety
-        # Or reuse pipeline logic if imported?
-        # Let's implement a lightweight converter here to avoid heavy imports
-
-        # Parse B/S
+        # Parse B/S into digit bitmasks; each neighbour flips one bit
         try:
             b_part, s_part = rule_str.split("/")
-            b_nums = set(int(c) for c in b_part[1:] if c.isdigit())
-            s_nums = set(int(c) for c in s_part[1:] if c.isdigit())
-
-            neighbors = []
-
-            # Flip B bits (0-8)
-            for i in range(9):
-                new_b = b_nums.copy()
-                if i in new_b:
-                    new_b.remove(i)
-                else:
-                    new_b.add(i)
-                neighbors.append(self._fmt(new_b, s_nums))
-
-            # Flip S bits (0-8)
-            for i in range(9):
-                new_s = s_nums.copy()
-                if i in new_s:
-                    new_s.remove(i)
-                else:
-                    new_s.add(i)
-                neighbors.append(self._fmt(b_nums, new_s))
-
-            return neighbors
+            b_mask = _digits_to_mask(b_part[1:])
+            s_mask = _digits_to_mask(s_part[1:])
         except ValueError:
             return []
 
-    def _fmt(self, b_set, s_set) -> str:
-        b = "".join(str(x) for x in sorted(list(b_set)))
-        s = "".join(str(x) for x in sorted(list(s_set)))
-        return f"B{b}/S{s}"
+        b_str = _mask_to_digits(b_mask)
+        s_str = _mask_to_digits(s_mask)
+        # Flip B bits (0-8), then S bits (0-8)
+        return [f"B{_mask_to_digits(b_mask ^ (1 << i))}/S{s_str}" for i in range(9)] + [
+            f"B{b_str}/S{_mask_to_digits(s_mask ^ (1 << i))}" for i in range(9)
+        ]
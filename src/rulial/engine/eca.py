@@ -1,10 +1,33 @@
 import numpy as np
 from typing import Literal, Optional
 
+try:
+    from numba import njit
+
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+if HAS_NUMBA:
+
+    @njit(cache=True)
+    def _evolve(spacetime, lookup_table):
+        """Fill spacetime[1:] from spacetime[0] on a periodic row."""
+        steps, width = spacetime.shape
+        for t in range(1, steps):
+            prev = spacetime[t - 1]
+            row = spacetime[t]
+            for i in range(width):
+                idx = (prev[i - 1] << 2) | (prev[i] << 1) | prev[(i + 1) % width]
+                row[i] = lookup_table[idx]
+
+
 class ECAEngine:
     """
     1D Elementary Cellular Automata (ECA) simulation engine.
-    Optimized for batch processing using NumPy vectorization.
+    Optimized for batch processing using NumPy vectorization; with numba
+    installed, the whole time loop runs in one compiled kernel.
     """
     
     def __init__(self, rule: int):
@@ -49,11 +72,18 @@ class ECAEngine:
             if len(custom_init) != width:
                 raise ValueError(f"Custom init length {len(custom_init)} must match width {width}")
             spacetime[0] = custom_init.astype(np.uint8)
+            # The compiled kernel indexes the lookup table unchecked
+            if spacetime[0].max(initial=0) > 1:
+                raise ValueError("Custom init must contain only 0/1 cells")
         elif init_condition == "single_seed":
             spacetime[0, width // 2] = 1
         elif init_condition == "random":
             spacetime[0] = np.random.randint(0, 2, size=width, dtype=np.uint8)
             
+        if HAS_NUMBA:
+            _evolve(spacetime, self.lookup_table)
+            return spacetime
+
         # Evolution loop
         # We use numpy roll to get left and right neighbors efficiently
         current_state = spacetime[0]
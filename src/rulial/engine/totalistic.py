@@ -1,13 +1,188 @@
-from typing import Tuple
+from typing import Optional, Sequence, Tuple
 
 import numpy as np
-from scipy.signal import convolve2d
+
+try:
+    from numba import njit, prange
+
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# Widest grid the bit-packed path handles: one uint64 word per row
+_PACKED_MAX_WIDTH = 64
+_ALL_ONES = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+# Offsets of the eight Moore neighbours into a 1-cell wrap-padded grid.
+_MOORE_OFFSETS = tuple(
+    (dy, dx) for dy in (0, 1, 2) for dx in (0, 1, 2) if (dy, dx) != (1, 1)
+)
+
+
+def _count_neighbors(grids: np.ndarray) -> np.ndarray:
+    """
+    Moore neighbor counts on a toroidal universe over the last two axes.
+    Summing 8 shifted views stays in uint8 (max count 8).
+    """
+    h, w = grids.shape[-2:]
+    pad = [(0, 0)] * (grids.ndim - 2) + [(1, 1), (1, 1)]
+    padded = np.pad(grids, pad, mode="wrap")
+    neighbors = np.zeros(grids.shape, dtype=np.uint8)
+    for dy, dx in _MOORE_OFFSETS:
+        neighbors += padded[..., dy : dy + h, dx : dx + w]
+    return neighbors
+
+
+if HAS_NUMBA:
+
+    @njit(cache=True)
+    def _step_into(grid, lut, out):
+        """One toroidal step of a 2D uint8 grid through lut, written to out."""
+        h, w = grid.shape
+        for i in range(h):
+            up = (i - 1) % h
+            down = (i + 1) % h
+            for j in range(w):
+                left = (j - 1) % w
+                right = (j + 1) % w
+                n = (
+                    grid[up, left] + grid[up, j] + grid[up, right]
+                    + grid[i, left] + grid[i, right]
+                    + grid[down, left] + grid[down, j] + grid[down, right]
+                )
+                out[i, j] = lut[grid[i, j], n]
+
+    @njit(cache=True)
+    def _evolve_history(history, lut):
+        """Fill history[1:] from history[0], entirely in compiled code."""
+        for t in range(1, history.shape[0]):
+            _step_into(history[t - 1], lut, history[t])
+
+    @njit(cache=True)
+    def _evolve_final(grid, lut, steps):
+        """Final grid after steps - 1 updates, ping-ponging two buffers."""
+        current = grid.copy()
+        scratch = np.empty_like(grid)
+        for _ in range(1, steps):
+            _step_into(current, lut, scratch)
+            current, scratch = scratch, current
+        return current
+
+    # Bit-packed (SWAR) path for grids at most 64 cells wide: row i is one
+    # uint64 with cell (i, j) in bit j, so every word op updates a whole row.
+
+    @njit(cache=True)
+    def _pack_rows(grid):
+        h, w = grid.shape
+        rows = np.zeros(h, dtype=np.uint64)
+        for i in range(h):
+            word = np.uint64(0)
+            for j in range(w):
+                if grid[i, j]:
+                    word |= np.uint64(1) << np.uint64(j)
+            rows[i] = word
+        return rows
+
+    @njit(cache=True)
+    def _unpack_rows(rows, out):
+        h, w = out.shape
+        for i in range(h):
+            word = rows[i]
+            for j in range(w):
+                out[i, j] = (word >> np.uint64(j)) & np.uint64(1)
+
+    @njit(cache=True)
+    def _packed_step(rows, out, w, born_planes, survive_planes):
+        """
+        One toroidal step on packed rows. The eight neighbour words are
+        summed bit-parallel into four count bit-planes (c0..c3), then each
+        count n present in the rule selects its cells via born_planes[n]
+        (all-ones if n is in B) or survive_planes[n] (if n is in S).
+        """
+        h = rows.shape[0]
+        one = np.uint64(1)
+        full = _ALL_ONES >> np.uint64(64 - w)
+        wrap = np.uint64(w - 1)
+        for i in range(h):
+            up = rows[(i - 1) % h]
+            mid = rows[i]
+            down = rows[(i + 1) % h]
+            c0 = c1 = c2 = c3 = np.uint64(0)
+            for k in range(8):
+                src = up if k < 3 else (mid if k < 5 else down)
+                if k == 0 or k == 3 or k == 5:
+                    x = ((src << one) | (src >> wrap)) & full
+                elif k == 2 or k == 4 or k == 7:
+                    x = ((src >> one) | (src << wrap)) & full
+                else:
+                    x = src
+                # Ripple-carry increment of the 4-bit per-cell counter
+                carry = c0 & x
+                c0 ^= x
+                x = carry
+                carry = c1 & x
+                c1 ^= x
+                x = carry
+                carry = c2 & x
+                c2 ^= x
+                c3 |= carry
+            nxt = np.uint64(0)
+            for n in range(9):
+                select = (~mid & born_planes[n]) | (mid & survive_planes[n])
+                if select == 0:
+                    continue
+                eq = c0 if n & 1 else ~c0
+                eq &= c1 if n & 2 else ~c1
+                eq &= c2 if n & 4 else ~c2
+                eq &= c3 if n & 8 else ~c3
+                nxt |= eq & select
+            out[i] = nxt & full
+
+    @njit(cache=True)
+    def _evolve_packed_history(history, born_planes, survive_planes):
+        """Fill history[1:] from history[0] via the packed stepper."""
+        w = history.shape[2]
+        current = _pack_rows(history[0])
+        scratch = np.empty_like(current)
+        for t in range(1, history.shape[0]):
+            _packed_step(current, scratch, w, born_planes, survive_planes)
+            current, scratch = scratch, current
+            _unpack_rows(current, history[t])
+
+    @njit(cache=True)
+    def _evolve_packed_final(grid, born_planes, survive_planes, steps):
+        """Final grid after steps - 1 packed updates."""
+        w = grid.shape[1]
+        current = _pack_rows(grid)
+        scratch = np.empty_like(current)
+        for _ in range(1, steps):
+            _packed_step(current, scratch, w, born_planes, survive_planes)
+            current, scratch = scratch, current
+        out = np.empty_like(grid)
+        _unpack_rows(current, out)
+        return out
+
+    # Batched kernels: R independent grids, each under its own rule, fill
+    # their (R, steps, h, w) history in one call, one rule per thread.
+
+    @njit(cache=True, parallel=True)
+    def _evolve_packed_history_batch(history, born_planes, survive_planes):
+        for r in prange(history.shape[0]):
+            _evolve_packed_history(history[r], born_planes[r], survive_planes[r])
+
+    @njit(cache=True, parallel=True)
+    def _evolve_history_batch(history, luts):
+        for r in prange(history.shape[0]):
+            _evolve_history(history[r], luts[r])
 
 
 class Totalistic2DEngine:
     """
     Engine for 2D Outer Totalistic Cellular Automata (e.g., Game of Life).
-    Uses convolution for efficient neighbor counting.
+    Counts neighbors with shifted views of a wrap-padded grid and applies
+    the rule through a (state, count) lookup table. When numba is
+    installed, simulate/simulate_final run the whole time loop in a
+    compiled kernel instead, on bit-packed rows for grids up to 64 wide.
     """
 
     def __init__(self, rule_string: str = "B3/S23"):
@@ -15,11 +190,28 @@ class Totalistic2DEngine:
         Initialize with a rule string (Golly/RLE format).
         Format: "B3/S23" (Game of Life) or "B3678/S34678" (Day & Night).
         """
-        self.born, self.survive = self._parse_rule(rule_string)
-
         # Moore Neighborhood Kernel
         self.kernel = np.array([[1, 1, 1], [1, 0, 1], [1, 1, 1]])
 
+        # Transition table: next = lut[state, neighbor_count]
+        self.lut = np.zeros((2, 9), dtype=np.uint8)
+        self.set_rule(rule_string)
+
+    def set_rule(self, rule_string: str) -> None:
+        """
+        Switch this engine to another rule in place, rewriting the
+        transition table, so one instance can be reused across a sweep.
+        """
+        self.born, self.survive = self._parse_rule(rule_string)
+
+        self.lut[:] = 0
+        self.lut[0, [n for n in self.born if 0 <= n <= 8]] = 1
+        self.lut[1, [n for n in self.survive if 0 <= n <= 8]] = 1
+
+        # The same table as all-ones / all-zeros words for the packed path
+        self.born_planes = np.where(self.lut[0] == 1, _ALL_ONES, np.uint64(0))
+        self.survive_planes = np.where(self.lut[1] == 1, _ALL_ONES, np.uint64(0))
+
     def _parse_rule(self, rule_str: str) -> Tuple[set, set]:
         """Parse Bx/Sy format."""
         # Normalize: ensure uppercase and standard order
@@ -46,12 +238,22 @@ class Totalistic2DEngine:
         init_condition: str = "random",
         density: float = 0.5,
         custom_grid: np.ndarray = None,
+        rng: Optional[np.random.Generator] = None,
     ) -> np.ndarray:
-        """Initialize the grid."""
+        """
+        Initialize the grid.
+        Random grids draw from ``rng`` when given, else the global NumPy state.
+        """
         if init_condition == "custom" and custom_grid is not None:
             grid = custom_grid.copy()
-        elif init_condition == "random":
+        elif init_condition == "random" and rng is None:
             grid = (np.random.random((height, width)) < density).astype(np.uint8)
+        elif init_condition == "random":
+            # float32 draws: half the bytes of the float64 default for a
+            # value that is only thresholded
+            grid = (rng.random((height, width), dtype=np.float32) < density).view(
+                np.uint8
+            )
         else:
             grid = np.zeros((height, width), dtype=np.uint8)
             # Center dot
@@ -60,25 +262,16 @@ class Totalistic2DEngine:
 
     def step(self, grid: np.ndarray) -> np.ndarray:
         """Advance the grid by one step."""
-        # 1. Count neighbors via convolution
-        # boundaries='wrap' for toroidal universe (standard for finite CA)
-        neighbors = convolve2d(grid, self.kernel, mode="same", boundary="wrap")
+        grid = np.asarray(grid, dtype=np.uint8)
+
+        # 1. Count neighbors on a toroidal universe (standard for finite CA)
+        neighbors = _count_neighbors(grid)
 
         # 2. Apply Rule
         # Born: Cell is 0 and neighbors in B set
         # Survive: Cell is 1 and neighbors in S set
         # Dies: Otherwise
-
-        # Vectorized rule application
-        is_alive = grid == 1
-        is_dead = grid == 0
-
-        # Create masks
-        born_mask = np.isin(neighbors, list(self.born)) & is_dead
-        survive_mask = np.isin(neighbors, list(self.survive)) & is_alive
-
-        next_grid = (born_mask | survive_mask).astype(np.uint8)
-        return next_grid
+        return self.lut[grid, neighbors]
 
     def simulate(
         self,
@@ -88,16 +281,32 @@ class Totalistic2DEngine:
         init_condition: str = "random",
         density: float = 0.5,
         custom_grid: np.ndarray = None,
+        rng: Optional[np.random.Generator] = None,
+        out: Optional[np.ndarray] = None,
     ) -> np.ndarray:
         """
         Simulate the CA.
+        Pass ``out`` (a C-contiguous uint8 (steps, height, width) array) to
+        reuse one history buffer across calls; every frame is overwritten.
         Returns: (steps, height, width) tensor.
         """
-        grid = self.init_grid(height, width, init_condition, density, custom_grid)
+        grid = self.init_grid(
+            height, width, init_condition, density, custom_grid, rng
+        )
 
-        history = np.zeros((steps, height, width), dtype=np.uint8)
+        if out is None:
+            history = np.zeros((steps, height, width), dtype=np.uint8)
+        else:
+            history = out
         history[0] = grid
 
+        if HAS_NUMBA and width <= _PACKED_MAX_WIDTH:
+            _evolve_packed_history(history, self.born_planes, self.survive_planes)
+            return history
+        if HAS_NUMBA:
+            _evolve_history(history, self.lut)
+            return history
+
         current_grid = grid
 
         for t in range(1, steps):
@@ -106,3 +315,91 @@ class Totalistic2DEngine:
             current_grid = next_grid
 
         return history
+
+    def simulate_final(
+        self,
+        height: int,
+        width: int,
+        steps: int,
+        init_condition: str = "random",
+        density: float = 0.5,
+        custom_grid: np.ndarray = None,
+        rng: Optional[np.random.Generator] = None,
+    ) -> np.ndarray:
+        """
+        Same as simulate(...)[-1], without materializing the history:
+        only the current grid is kept alive between steps.
+        Returns: (height, width) grid.
+        """
+        grid = self.init_grid(
+            height, width, init_condition, density, custom_grid, rng
+        )
+        grid = np.asarray(grid, dtype=np.uint8)
+        if HAS_NUMBA:
+            grid = np.ascontiguousarray(grid)
+            if grid.shape[1] <= _PACKED_MAX_WIDTH:
+                return _evolve_packed_final(
+                    grid, self.born_planes, self.survive_planes, steps
+                )
+            return _evolve_final(grid, self.lut, steps)
+        for _ in range(1, steps):
+            grid = self.step(grid)
+        return grid
+
+    @staticmethod
+    def step_batch(grids: np.ndarray, luts: np.ndarray) -> np.ndarray:
+        """
+        Advance R grids by one step, each under its own rule.
+
+        Args:
+            grids: (R, height, width) uint8 stack.
+            luts: (R, 2, 9) transition tables, one per grid.
+        """
+        grids = np.asarray(grids, dtype=np.uint8)
+        neighbors = _count_neighbors(grids)
+        sheet = np.arange(grids.shape[0])[:, None, None]
+        return luts[sheet, grids, neighbors]
+
+    @staticmethod
+    def simulate_batch(
+        engines: Sequence["Totalistic2DEngine"],
+        height: int,
+        width: int,
+        steps: int,
+        init_condition: str = "random",
+        density: float = 0.5,
+        rng: Optional[np.random.Generator] = None,
+    ) -> np.ndarray:
+        """
+        Simulate several rules side by side on one (R, height, width) stack,
+        amortizing per-step overhead across the batch. With numba, the
+        rules are evolved in parallel inside a single compiled call.
+        Returns: (R, steps, height, width) tensor.
+        """
+        luts = np.stack([e.lut for e in engines])
+        grids = np.stack(
+            [
+                e.init_grid(height, width, init_condition, density, rng=rng)
+                for e in engines
+            ]
+        )
+
+        history = np.zeros((len(engines), steps, height, width), dtype=np.uint8)
+        history[:, 0] = grids
+
+        if HAS_NUMBA:
+            if width <= _PACKED_MAX_WIDTH:
+                _evolve_packed_history_batch(
+                    history,
+                    np.stack([e.born_planes for e in engines]),
+                    np.stack([e.survive_planes for e in engines]),
+                )
+            else:
+                _evolve_history_batch(history, luts)
+            return history
+
+        for t in range(1, steps):
+            grids = Totalistic2DEngine.step_batch(grids, luts)
+            history[:, t] = grids
+
+        return history
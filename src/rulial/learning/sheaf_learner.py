@@ -3,6 +3,13 @@ import torch
 import torch.nn as nn
 from torch_geometric.nn import MessagePassing
 
+try:
+    from torch_sparse import SparseTensor, matmul
+
+    HAS_TORCH_SPARSE = True
+except ImportError:
+    HAS_TORCH_SPARSE = False
+
 
 class SheafLaplacianLayer(MessagePassing):
     """
@@ -35,7 +42,11 @@ class SheafLaplacianLayer(MessagePassing):
     def forward(self, x, edge_index):
         # 1. Learn Restriction Maps
         # We process edges: predict F_{u->v} from (x_u, x_v)
-        row, col = edge_index
+        if HAS_TORCH_SPARSE and isinstance(edge_index, SparseTensor):
+            # Transposed adjacency (adj_t): rows are targets, cols are sources
+            col, row, _ = edge_index.coo()
+        else:
+            row, col = edge_index
         
         # Concatenate edge features
         edge_input = torch.cat([x[row], x[col]], dim=-1)
@@ -71,6 +82,12 @@ class SheafLaplacianLayer(MessagePassing):
         
         return x_j * restrictions
 
+    def message_and_aggregate(self, adj_t, x, restrictions):
+        # Fused path for a SparseTensor adj_t: the per-edge restrictions (in
+        # adj_t's CSR order, see forward) become its values, and message +
+        # add-aggregation collapse into one sparse-dense matmul
+        return matmul(adj_t.set_value(restrictions.view(-1), layout="coo"), x, reduce="sum")
+
     def update(self, aggr_out, x):
         # Update node: x_new = x - alpha * (Degree * x - Aggregation)
         # This is a bit simplified. A proper diagonal degree matrix D depends on restrictions.
@@ -10,6 +10,7 @@ Based on the discovery of B078/S012478 and MSM Theory.
 """
 
 from dataclasses import dataclass
+from typing import Optional
 
 import numpy as np
 
@@ -61,26 +62,39 @@ class VacuumCondensateAnalyzer:
         self.grid_size = grid_size
         self.steps = steps
 
+        # Reused across analyze() calls: one engine (rule swapped in with
+        # set_rule) and one history buffer, allocated on first use
+        self._engine: Optional[Totalistic2DEngine] = None
+        self._history: Optional[np.ndarray] = None
+
     def _measure_equilibrium(
         self,
         engine: Totalistic2DEngine,
         initial_density: float,
+        rng: Optional[np.random.Generator] = None,
     ) -> tuple[float, float, int]:
         """
         Measure equilibrium density from a given starting density.
 
         Returns: (final_density, variance, relaxation_time)
         """
+        if self._history is None:
+            self._history = np.empty(
+                (self.steps, self.grid_size, self.grid_size), dtype=np.uint8
+            )
         history = engine.simulate(
             self.grid_size,
             self.grid_size,
             self.steps,
             "random",
             density=initial_density,
+            rng=rng,
+            out=self._history,
         )
 
+        # Live-cell fraction per frame, one pass over the whole history
         total_cells = self.grid_size * self.grid_size
-        populations = [h.sum() / total_cells for h in history]
+        populations = np.count_nonzero(history, axis=(1, 2)) / total_cells
 
         # Equilibrium = last 20% of simulation
         equil_start = int(len(populations) * 0.8)
@@ -91,11 +105,8 @@ class VacuumCondensateAnalyzer:
 
         # Relaxation time: when does it reach 90% of final value?
         target = 0.9 * final_density
-        relax_time = self.steps
-        for i, pop in enumerate(populations):
-            if pop >= target:
-                relax_time = i
-                break
+        reached = np.flatnonzero(populations >= target)
+        relax_time = int(reached[0]) if reached.size else self.steps
 
         return float(final_density), float(variance), relax_time
 
@@ -104,13 +115,14 @@ class VacuumCondensateAnalyzer:
         grid = np.zeros((32, 32), dtype=np.uint8)
         grid[16, 16] = 1
 
-        history = engine.simulate(32, 32, 100, "custom", custom_grid=grid)
-        return int(history[-1].sum())
+        final = engine.simulate_final(32, 32, 100, "custom", custom_grid=grid)
+        return int(final.sum())
 
     def _find_critical_density(
         self,
         engine: Totalistic2DEngine,
         equilibrium: float,
+        rng: Optional[np.random.Generator] = None,
     ) -> float:
         """
         Find the critical density where growth ≈ decay.
@@ -123,12 +135,16 @@ class VacuumCondensateAnalyzer:
         for _ in range(8):  # 8 iterations for precision
             mid = (low + high) / 2
 
-            history = engine.simulate(
-                self.grid_size, self.grid_size, 50, "random", density=mid
+            # Only the first and last frames matter: no history needed
+            grid = engine.init_grid(
+                self.grid_size, self.grid_size, "random", density=mid, rng=rng
+            )
+            final_grid = engine.simulate_final(
+                self.grid_size, self.grid_size, 50, "custom", custom_grid=grid
             )
 
-            initial = history[0].sum()
-            final = history[-1].sum()
+            initial = grid.sum()
+            final = final_grid.sum()
 
             if initial == 0:
                 low = mid
@@ -139,28 +155,40 @@ class VacuumCondensateAnalyzer:
 
         return (low + high) / 2
 
-    def analyze(self, rule_str: str) -> CondensateAnalysis:
-        """Perform full vacuum condensate analysis."""
-        engine = Totalistic2DEngine(rule_str)
+    def analyze(
+        self, rule_str: str, rng: Optional[np.random.Generator] = None
+    ) -> CondensateAnalysis:
+        """
+        Perform full vacuum condensate analysis.
+
+        Random initial grids draw from ``rng`` when given (pass one per
+        worker/task for independent, reproducible streams), else from the
+        global NumPy state.
+        """
+        if self._engine is None:
+            self._engine = Totalistic2DEngine(rule_str)
+        else:
+            self._engine.set_rule(rule_str)
+        engine = self._engine
 
         # 1. Test single cell expansion
         single_cell_result = self._test_single_cell(engine)
         is_condensate = single_cell_result > 10  # Expanded significantly
 
         # 2. Measure equilibrium from low density
-        eq_density_low, var_low, _ = self._measure_equilibrium(engine, 0.05)
+        eq_density_low, var_low, _ = self._measure_equilibrium(engine, 0.05, rng)
 
         # 3. Measure equilibrium from high density
-        eq_density_high, var_high, _ = self._measure_equilibrium(engine, 0.4)
+        eq_density_high, var_high, _ = self._measure_equilibrium(engine, 0.4, rng)
 
         # 4. Average equilibrium density
         equilibrium = (eq_density_low + eq_density_high) / 2
 
         # 5. Measure relaxation time
-        _, _, relax_time = self._measure_equilibrium(engine, 0.1)
+        _, _, relax_time = self._measure_equilibrium(engine, 0.1, rng)
 
         # 6. Find critical density
-        critical = self._find_critical_density(engine, equilibrium)
+        critical = self._find_critical_density(engine, equilibrium, rng)
 
         # 7. Stability variance
         variance = (var_low + var_high) / 2
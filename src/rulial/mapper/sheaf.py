@@ -76,8 +76,7 @@ def default_simulator(rule_str: str, size: int, steps: int, seed: int) -> np.nda
 
     np.random.seed(seed)
     engine = Totalistic2DEngine(rule_str)
-    history = engine.simulate(size, size, steps, "random", density=0.3)
-    return history[-1]
+    return engine.simulate_final(size, size, steps, "random", density=0.3)
 
 
 class SheafAnalyzer:
@@ -114,6 +113,10 @@ class SheafAnalyzer:
         self._cached_adj: Optional[sparse.csr_matrix] = None
         self._cached_laplacian: Optional[sparse.csr_matrix] = None
         self._cached_delta0: Optional[sparse.csr_matrix] = None
+        # Rule-independent results derived from the cached graph: cohomology
+        # and spectral invariants, and the Laplacian's near-kernel eigenpairs
+        self._cached_invariants: Optional[tuple] = None
+        self._cached_kernel_eigs: Optional[Tuple[np.ndarray, np.ndarray]] = None
 
     def _build_adjacency_sparse(self, h: int, w: int) -> sparse.csr_matrix:
         """
@@ -123,22 +126,15 @@ class SheafAnalyzer:
         For 64x64 grid: ~32K non-zeros instead of 16M entries.
         """
         n = h * w
-        rows, cols, data = [], [], []
-
-        for i in range(h):
-            for j in range(w):
-                idx = i * w + j
-                # 8 neighbors (with wrapping)
-                for di in [-1, 0, 1]:
-                    for dj in [-1, 0, 1]:
-                        if di == 0 and dj == 0:
-                            continue
-                        ni = (i + di) % h
-                        nj = (j + dj) % w
-                        nidx = ni * w + nj
-                        rows.append(idx)
-                        cols.append(nidx)
-                        data.append(1.0)
+        i, j = np.divmod(np.arange(n), w)
+        # 8 neighbors (with wrapping), in row-major (di, dj) order per cell
+        offsets = [(di, dj) for di in (-1, 0, 1) for dj in (-1, 0, 1) if di or dj]
+        nbrs = np.stack(
+            [((i + di) % h) * w + (j + dj) % w for di, dj in offsets], axis=1
+        )
+        rows = np.repeat(np.arange(n), len(offsets))
+        cols = nbrs.ravel()
+        data = np.ones(rows.size, dtype=np.float32)
 
         return sparse.csr_matrix((data, (rows, cols)), shape=(n, n), dtype=np.float32)
 
@@ -150,24 +146,24 @@ class SheafAnalyzer:
         For each edge (u, v): δ₀(f)_e = f(v) - f(u)
         """
         n = h * w
-        rows, cols, data = [], [], []
-        edge_idx = 0
-
-        # Only count edges in one direction to avoid duplicates
-        for i in range(h):
-            for j in range(w):
-                idx = i * w + j
-                for di, dj in [(0, 1), (1, 0), (1, 1), (1, -1)]:
-                    ni = (i + di) % h
-                    nj = (j + dj) % w
-                    nidx = ni * w + nj
-                    if nidx > idx:
-                        rows.extend([edge_idx, edge_idx])
-                        cols.extend([idx, nidx])
-                        data.extend([-1.0, 1.0])
-                        edge_idx += 1
-
-        m = edge_idx
+        i, j = np.divmod(np.arange(n), w)
+        idx = np.arange(n)[:, None]
+        nidx = np.stack(
+            [
+                ((i + di) % h) * w + (j + dj) % w
+                for di, dj in [(0, 1), (1, 0), (1, 1), (1, -1)]
+            ],
+            axis=1,
+        )
+        # Only count edges in one direction to avoid duplicates; nonzero()
+        # walks (cell, direction) in row-major order, numbering edges as the
+        # cells are visited
+        cell, direction = np.nonzero(nidx > idx)
+        m = cell.size
+        rows = np.repeat(np.arange(m), 2)
+        cols = np.stack([cell, nidx[cell, direction]], axis=1).ravel()
+        data = np.tile(np.array([-1.0, 1.0], dtype=np.float32), m)
+
         return (
             sparse.csr_matrix((data, (rows, cols)), shape=(m, n), dtype=np.float32),
             m,
@@ -191,6 +187,8 @@ class SheafAnalyzer:
             )
             self._cached_delta0, _ = self._build_coboundary_sparse(h, w)
             self._cached_size = size_key
+            self._cached_invariants = None
+            self._cached_kernel_eigs = None
         return self._cached_adj, self._cached_laplacian, self._cached_delta0
 
     def _compute_cohomology_sparse(self, delta0: sparse.csr_matrix) -> Tuple[int, int]:
@@ -308,7 +306,7 @@ class SheafAnalyzer:
 
             # Use sparse eigensolver to find smallest eigenvalues
             # 'SM' = smallest magnitude eigenvalues (kernel vectors)
-            eigenvals, eigenvecs = eigsh(L, k=k, which="SM", tol=1e-4)
+            eigenvals, eigenvecs = self._kernel_eigs(L, k)
 
             # Identify kernel vectors (eigenvalue < threshold)
             kernel_threshold = 1e-6
@@ -347,6 +345,20 @@ class SheafAnalyzer:
             f_harmonic = np.ones(n) * f_mean / np.sqrt(n)
         return harmonic_overlap, gradient_norm
 
+    def _kernel_eigs(
+        self, L: sparse.csr_matrix, k: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Smallest-magnitude eigenpairs of L. They depend only on the grid
+        graph, so they are solved once per cached Laplacian, not per rule.
+        """
+        if L is self._cached_laplacian and self._cached_kernel_eigs is not None:
+            return self._cached_kernel_eigs
+        eigs = eigsh(L, k=k, which="SM", tol=1e-4)
+        if L is self._cached_laplacian:
+            self._cached_kernel_eigs = eigs
+        return eigs
+
     def _compute_monodromy(self, rule_str: str, simulator: Simulator) -> float:
         """
         Compute the Monodromy Index via Sheaf Path Integral (Exact).
@@ -381,12 +393,10 @@ class SheafAnalyzer:
         from rulial.engine.totalistic import Totalistic2DEngine
 
         engine = Totalistic2DEngine(rule_str)
-        history = engine.simulate(
+        evolved_state = engine.simulate_final(
             grid_width, grid_height, steps, "custom", custom_grid=cycle_grid
         )
 
-        evolved_state = history[-1]
-
         # 3. Measure Holonomy (Ratio of topological mass)
         initial_mass = cycle_grid.sum()
         final_mass = evolved_state.sum()
@@ -440,12 +450,17 @@ class SheafAnalyzer:
         # Get cached graph structures
         adj, L, delta0 = self._get_cached_structures(h, w)
 
-        # Compute cohomology
-        h0, h1 = self._compute_cohomology_sparse(delta0)
-
-        # Compute spectral properties
-        spectral_gap, effective_resistance, eigenvalues = (
-            self._compute_spectral_properties_sparse(L)
+        # Cohomology and spectral properties depend only on the grid graph:
+        # solve them once per grid size and reuse them for every rule
+        if self._cached_invariants is None:
+            h0, h1 = self._compute_cohomology_sparse(delta0)
+            self._cached_invariants = (
+                h0,
+                h1,
+                *self._compute_spectral_properties_sparse(L),
+            )
+        h0, h1, spectral_gap, effective_resistance, eigenvalues = (
+            self._cached_invariants
         )
 
         # Compute Hodge decomposition
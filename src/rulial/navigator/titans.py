@@ -1,4 +1,4 @@
-from typing import Tuple
+from typing import List, Tuple
 
 import numpy as np
 import torch
@@ -168,6 +168,23 @@ class TitansNavigator:
         Returns:
             (best_neighbor_vector, predicted_entropy)
         """
+        neighbors, predicted = self.hallucinate_candidates(
+            current_rule, k=1, num_neighbors=num_neighbors
+        )
+        return neighbors[0], float(predicted[0])
+
+    def hallucinate_candidates(
+        self, current_rule: np.ndarray, k: int = 1, num_neighbors: int = 10
+    ) -> Tuple[List[np.ndarray], np.ndarray]:
+        """
+        Like hallucinate_neighbors, but returns the k most promising
+        neighbors so callers can evaluate them as one batch.
+
+        Returns:
+            (neighbor_vectors, predicted_entropies), best first
+        """
+        num_neighbors = max(num_neighbors, k)
+
         # Generate random bit-flip neighbors
         neighbors = []
         vectors = []
@@ -189,7 +206,7 @@ class TitansNavigator:
             predicted_tensor = self.memory(batch_x)
             predicted_entropies = predicted_tensor.cpu().numpy().flatten()
 
-        # Return neighbor that minimizes distance to TARGET ENTROPY
+        # Return neighbors that minimize distance to TARGET ENTROPY
         # Hypothesis: Class 4 "Life" lives on the Edge of Chaos.
         # Max Entropy (1.0) is Chaos/Volume Law.
         # Zero Entropy (0.0) is Ice/Area Law (Trivial).
@@ -199,6 +216,6 @@ class TitansNavigator:
 
         # distance = abs(pred - TARGET)
         distances = np.abs(predicted_entropies - TARGET)
-        best_idx = np.argmin(distances)
+        best = np.argsort(distances, kind="stable")[:k]
 
-        return neighbors[best_idx], float(predicted_entropies[best_idx])
+        return [neighbors[i] for i in best], predicted_entropies[best]
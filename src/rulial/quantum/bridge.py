@@ -12,6 +12,12 @@ class TensorBridge:
     via Cluster State construction + Projection.
     """
 
+    # Strict limit on dense contraction size.
+    # Contraction scales exponentially with open indices (qubits).
+    # Limit adjusted for standard desktop usage.
+    HARD_QUBIT_LIMIT = 22  # 2^24 * 16 bytes ~ 268 MB state vector. Safe.
+    # 2^30 ~ 16 GB (Danger zone).
+
     def __init__(self, height: int, width: int):
         self.H = height
         self.W = width
@@ -99,13 +105,7 @@ class TensorBridge:
         if not open_inds:
             return {"entropy": 0.0, "status": "empty_state"}
 
-        # Strict limit on dense contraction size.
-        # Contraction scales exponentially with open indices (qubits).
-        # Limit adjusted for standard desktop usage.
-        HARD_QUBIT_LIMIT = 22  # 2^24 * 16 bytes ~ 268 MB state vector. Safe.
-        # 2^30 ~ 16 GB (Danger zone).
-
-        if len(open_inds) > HARD_QUBIT_LIMIT:
+        if len(open_inds) > self.HARD_QUBIT_LIMIT:
             return {
                 "entropy": -1.0,
                 "status": "volume_law_truncation",
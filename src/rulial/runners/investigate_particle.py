@@ -75,13 +75,16 @@ def pattern_hash(pattern: np.ndarray) -> str:
     return ''.join(str(c) for c in pattern.flatten())
 
 
-def investigate_rule(rule_str: str, steps: int = 200, grid_size: int = 64):
+def investigate_rule(rule_str: str, steps: int = 200, grid_size: int = 64, verbose: bool = True):
     """
     Investigate a rule for computational structures.
+    
+    With verbose=False nothing is printed; only the census dict is returned.
     """
-    print(f"🕵️ Investigating: {rule_str}")
-    print(f"   Grid: {grid_size}x{grid_size}, Steps: {steps}")
-    print()
+    if verbose:
+        print(f"🕵️ Investigating: {rule_str}")
+        print(f"   Grid: {grid_size}x{grid_size}, Steps: {steps}")
+        print()
     
     engine = Totalistic2DEngine(rule_str)
     
@@ -139,6 +142,15 @@ def investigate_rule(rule_str: str, steps: int = 200, grid_size: int = 64):
         else:
             transients.append(pattern)
     
+    census = {
+        'still_lifes': len(still_lifes),
+        'oscillators': len(oscillators),
+        'gliders': len(gliders),
+        'transients': len(transients)
+    }
+    if not verbose:
+        return census
+    
     # Report
     print("═══ STRUCTURE CENSUS ═══")
     print(f"  Still Lifes:  {len(still_lifes)}")
@@ -178,12 +190,7 @@ def investigate_rule(rule_str: str, steps: int = 200, grid_size: int = 64):
     else:
         print("💨 No persistent structures - Chaotic rule")
     
-    return {
-        'still_lifes': len(still_lifes),
-        'oscillators': len(oscillators),
-        'gliders': len(gliders),
-        'transients': len(transients)
-    }
+    return census
 
 
 def _print_pattern(pattern: np.ndarray):
@@ -1,6 +1,8 @@
 import asyncio
+import functools
 import os
 
+import numpy as np
 import uvicorn
 from fastapi import FastAPI, WebSocket
 from fastapi.responses import RedirectResponse
@@ -74,6 +76,7 @@ class ProbeRequest(BaseModel):
     rule: int
     steps: int = 500
     width: int = 200
+    seed: int = 42
 
 
 class NavigateRequest(BaseModel):
@@ -92,14 +95,17 @@ class AnalysisResult(BaseModel):
     classification: str
 
 
-@app.post("/probe", response_model=AnalysisResult)
-async def probe_rule(req: ProbeRequest):
+@functools.lru_cache(maxsize=256)
+def _probe_analysis(rule: int, steps: int, width: int, seed: int):
     """
-    Run a full analysis on a single rule.
+    Simulation plus V1/V2 analyses for one probe. The random initial row is
+    drawn from seed, so the result is fixed by the arguments and repeated
+    probes of the same rule are answered from memory.
     """
     # 1. Simulate
-    engine = ECAEngine(req.rule)
-    spacetime = engine.simulate(req.width, req.steps, init_condition="random")
+    engine = ECAEngine(rule)
+    init = np.random.default_rng(seed).integers(0, 2, size=width, dtype=np.uint8)
+    spacetime = engine.simulate(width, steps, custom_init=init)
 
     # 2. Compress (V1)
     telemetry = telemetry_analyzer.analyze(spacetime)
@@ -113,6 +119,18 @@ async def probe_rule(req: ProbeRequest):
     # 5. Quantum Superfluid (V2)
     sf_data = superfluid.analyze(spacetime)
 
+    return telemetry, w_class, topo, sf_data
+
+
+@app.post("/probe", response_model=AnalysisResult)
+async def probe_rule(req: ProbeRequest):
+    """
+    Run a full analysis on a single rule.
+    """
+    telemetry, w_class, topo, sf_data = _probe_analysis(
+        req.rule, req.steps, req.width, req.seed
+    )
+
     # 7. Record
     atlas.record(req.rule, telemetry, w_class, topo)
 